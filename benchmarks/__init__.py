@@ -0,0 +1 @@
+"""Microbenchmarks for the shared utilities."""
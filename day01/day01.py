@@ -1,13 +1,17 @@
 """Day 01."""
+import re
 from heapq import nlargest
 from typing import TextIO
 
 from result import Result
-from utils.parse import read_groups, read_lines
+from utils.parse import read_buffer
+
+BLANK_LINE = re.compile(rb"\r?\n\r?\n")
 
 
 def run(file: TextIO) -> Result:
     """Solution for Day 01."""
-    groups = read_groups(read_lines(file), "", int)
-    result = nlargest(3, [sum(x) for x in groups])
+    # Groups are only a few lines long, too short to be worth parse_ints' setup
+    groups = BLANK_LINE.split(read_buffer(file))
+    result = nlargest(3, [sum(map(int, group.split())) for group in groups])
     return Result(result[0], sum(result))
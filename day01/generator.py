@@ -0,0 +1,16 @@
+"""Input generator for Day 01."""
+from random import Random
+from typing import TextIO
+
+DEFAULT_SCALE = 2250
+
+
+def generate(file: TextIO, scale: int, rng: Random) -> None:
+    """Write `scale` calorie counts, split between elves carrying up to 15 items each."""
+    written = 0
+    while written < scale:
+        items = min(rng.randint(1, 15), scale - written)
+        file.writelines(f"{rng.randint(1000, 70000)}\n" for _ in range(items))
+        written += items
+        if written < scale:
+            file.write("\n")
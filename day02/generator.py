@@ -0,0 +1,10 @@
+"""Input generator for Day 02."""
+from random import Random
+from typing import TextIO
+
+DEFAULT_SCALE = 2500
+
+
+def generate(file: TextIO, scale: int, rng: Random) -> None:
+    """Write `scale` rounds of the strategy guide."""
+    file.writelines(f"{rng.choice('ABC')} {rng.choice('XYZ')}\n" for _ in range(scale))
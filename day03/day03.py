@@ -1,15 +1,20 @@
 """Day 03."""
 
+import string
 from typing import TextIO
 
 from result import Result
+from utils.bitset import Alphabet, iter_bits
 from utils.iterables import grouper
 from utils.parse import read_lines
 
+# In priority order, so an item's priority is one more than its bit position
+ITEMS = Alphabet(string.ascii_lowercase + string.ascii_uppercase)
 
-def priority(c: str) -> int:
-    """Get the priority of a rucksack item"""
-    return (ord(c) - ord("a") + 1) if c.islower() else (ord(c) - ord("A") + 27)
+
+def total_priority(mask: int) -> int:
+    """Get the total priority of a set of rucksack items."""
+    return sum(bit + 1 for bit in iter_bits(mask))
 
 
 def run(file: TextIO) -> Result:
@@ -17,11 +22,12 @@ def run(file: TextIO) -> Result:
     part1 = 0
     part2 = 0
     for group in grouper(read_lines(file), 3):
+        badge_mask = ITEMS.full
         for backpack in group:
-            compartment1 = set(backpack[: len(backpack) // 2])
-            compartment2 = set(backpack[len(backpack) // 2 :])
-            part1 += sum(priority(x) for x in compartment1 & compartment2)
-        badge_set = set.intersection(*(set(s) for s in group))
-        part2 += priority(badge_set.pop())
+            compartment1 = ITEMS.mask(backpack[: len(backpack) // 2])
+            compartment2 = ITEMS.mask(backpack[len(backpack) // 2 :])
+            part1 += total_priority(compartment1 & compartment2)
+            badge_mask &= compartment1 | compartment2
+        part2 += total_priority(badge_mask)
 
     return Result(part1, part2)
@@ -0,0 +1,30 @@
+"""Input generator for Day 03."""
+import string
+from random import Random
+from typing import TextIO
+
+DEFAULT_SCALE = 300
+
+
+def rucksack(rng: Random, items: str, badge: str) -> str:
+    """Build a rucksack whose compartments share only the first item.
+
+    The badge goes in one compartment and the rest are filled from disjoint pools.
+    """
+    shared, left_pool, right_pool = items[0], items[1:9], items[9:]
+    size = rng.randint(4, 24)
+    left = [shared] + rng.choices(left_pool, k=size - 1)
+    right = [shared] + rng.choices(right_pool, k=size - 1)
+    rng.choice([left, right])[-1] = badge
+    rng.shuffle(left)
+    rng.shuffle(right)
+    return "".join(left + right)
+
+
+def generate(file: TextIO, scale: int, rng: Random) -> None:
+    """Write `scale` rucksacks (rounded up to a whole group of three)."""
+    for _ in range(-(scale // -3)):
+        shuffled = rng.sample(string.ascii_letters, len(string.ascii_letters))
+        badge, letters = shuffled[0], "".join(shuffled[1:])
+        for elf in range(3):
+            file.write(rucksack(rng, letters[elf * 17 : (elf + 1) * 17], badge) + "\n")
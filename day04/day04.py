@@ -1,40 +1,21 @@
 """Day 04."""
 from __future__ import annotations
 
-from dataclasses import dataclass
 from typing import TextIO
 
 from result import Result
-
-
-@dataclass
-class IntRange:
-    """A range of integers."""
-
-    left: int
-    right: int
-
-    @staticmethod
-    def from_string(s: str) -> IntRange:
-        """Parse from a string in format left-right."""
-        left, right = s.split("-")
-        return IntRange(int(left), int(right))
-
-    def contains(self, other: IntRange) -> bool:
-        """Check if this range fully contains another."""
-        return self.left <= other.left and self.right >= other.right
-
-    def overlaps(self, other: IntRange) -> bool:
-        """Check if this range overlaps with the other at all."""
-        return not (self.right < other.left or self.left > other.right)
+from utils.intervals import Interval
+from utils.parse import read_int_table
 
 
 def run(file: TextIO) -> Result:
     """Solution for Day 04."""
+    # Each row is the start and end of one elf's range, then the other's
+    table = read_int_table(file, 4, signed=False)
     contains_count = 0
     overlaps_count = 0
-    for line in file:
-        elf1, elf2 = [IntRange.from_string(s) for s in line.split(",")]
+    for start1, end1, start2, end2 in table.rows():
+        elf1, elf2 = Interval(start1, end1), Interval(start2, end2)
         if elf1.contains(elf2) or elf2.contains(elf1):
             contains_count += 1
         if elf1.overlaps(elf2):
@@ -0,0 +1,18 @@
+"""Input generator for Day 04."""
+from random import Random
+from typing import TextIO
+
+DEFAULT_SCALE = 1000
+
+
+def section_range(rng: Random) -> str:
+    """Pick a random range of sections."""
+    left = rng.randint(1, 99)
+    return f"{left}-{rng.randint(left, 99)}"
+
+
+def generate(file: TextIO, scale: int, rng: Random) -> None:
+    """Write `scale` pairs of section assignments."""
+    file.writelines(
+        f"{section_range(rng)},{section_range(rng)}\n" for _ in range(scale)
+    )
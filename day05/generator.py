@@ -0,0 +1,29 @@
+"""Input generator for Day 05."""
+import string
+from random import Random
+from typing import TextIO
+
+DEFAULT_SCALE = 500
+STACKS = 9
+
+
+def generate(file: TextIO, scale: int, rng: Random) -> None:
+    """Write a drawing of nine stacks of crates followed by `scale` valid moves."""
+    heights = [rng.randint(1, 8) for _ in range(STACKS)]
+    for level in reversed(range(max(heights))):
+        file.write(
+            " ".join(
+                f"[{rng.choice(string.ascii_uppercase)}]" if height > level else "   "
+                for height in heights
+            )
+            + "\n"
+        )
+    file.write(" ".join(f" {i + 1} " for i in range(STACKS)) + "\n\n")
+
+    for _ in range(scale):
+        from_stack = rng.choice([i for i, height in enumerate(heights) if height > 0])
+        to_stack = rng.choice([i for i in range(STACKS) if i != from_stack])
+        num = rng.randint(1, heights[from_stack])
+        heights[from_stack] -= num
+        heights[to_stack] += num
+        file.write(f"move {num} from {from_stack + 1} to {to_stack + 1}\n")
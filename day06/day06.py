@@ -1,17 +1,29 @@
 """Day 06."""
 
-from typing import Iterable, TextIO
+import string
+from typing import TextIO
 
 from result import Result
-from utils.iterables import sliding_window
+from utils.bitset import Alphabet, popcount
 from utils.parse import read_lines
 
+LETTERS = Alphabet(string.ascii_lowercase)
 
-def find_first_unique_window(data: Iterable[str], window_size: int) -> int:
-    """Find the first set of n consecutive characters in data that are all unique."""
-    for i, window in enumerate(sliding_window(data, window_size)):
-        if len(set(window)) == window_size:
-            return i + window_size
+
+def find_first_unique_window(data: str, window_size: int) -> int:
+    """Find the first set of n consecutive characters in data that are all unique.
+
+    Each character toggles its bit as it enters and leaves the window, so a repeated
+    character cancels itself out and the window is unique once every bit is set.
+    """
+    bits = [LETTERS.bit(c) for c in data]
+    mask = 0
+    for i, bit in enumerate(bits):
+        mask ^= bit
+        if i >= window_size:
+            mask ^= bits[i - window_size]
+        if popcount(mask) == window_size:
+            return i + 1
     raise Exception("No window found")
 
 
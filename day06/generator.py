@@ -0,0 +1,17 @@
+"""Input generator for Day 06."""
+import string
+from random import Random
+from typing import TextIO
+
+DEFAULT_SCALE = 4096
+
+
+def generate(file: TextIO, scale: int, rng: Random) -> None:
+    """Write a datastream of `scale` characters with both markers near the end.
+
+    Everything before the last 14 characters uses only three letters, so no marker can
+    start until then.
+    """
+    prefix_length = max(scale - 14, 0)
+    file.write("".join(rng.choices("abc", k=prefix_length)))
+    file.write("".join(rng.sample(string.ascii_lowercase, 14)) + "\n")
@@ -0,0 +1,58 @@
+"""Input generator for Day 07."""
+from __future__ import annotations
+
+import string
+from dataclasses import dataclass, field
+from random import Random
+from typing import TextIO
+
+DEFAULT_SCALE = 300
+MAX_DEPTH = 20
+
+
+@dataclass
+class Directory:
+    """A directory in the generated filesystem."""
+
+    depth: int
+    subdirectories: dict[str, Directory] = field(default_factory=dict)
+    files: dict[str, int] = field(default_factory=dict)
+
+
+def new_name(rng: Random, taken: set[str], extension: str = "") -> str:
+    """Pick a name that isn't taken yet."""
+    while True:
+        name = "".join(rng.choices(string.ascii_lowercase, k=rng.randint(1, 8)))
+        name += extension
+        if name not in taken:
+            return name
+
+
+def write_session(file: TextIO, directory: Directory) -> None:
+    """Write the commands and output from exploring a directory depth-first."""
+    file.write("$ ls\n")
+    file.writelines(f"dir {name}\n" for name in directory.subdirectories)
+    file.writelines(f"{size} {name}\n" for name, size in directory.files.items())
+    for name, subdirectory in directory.subdirectories.items():
+        file.write(f"$ cd {name}\n")
+        write_session(file, subdirectory)
+        file.write("$ cd ..\n")
+
+
+def generate(file: TextIO, scale: int, rng: Random) -> None:
+    """Write a terminal session exploring a filesystem with `scale` files."""
+    root = Directory(0)
+    directories = [root]
+    for _ in range(scale // 3):
+        parent = rng.choice([d for d in directories[-50:] if d.depth < MAX_DEPTH])
+        taken = set(parent.subdirectories) | set(parent.files)
+        directory = Directory(parent.depth + 1)
+        parent.subdirectories[new_name(rng, taken)] = directory
+        directories.append(directory)
+    for _ in range(scale):
+        directory = rng.choice(directories)
+        taken = set(directory.subdirectories) | set(directory.files)
+        directory.files[new_name(rng, taken, ".txt")] = rng.randint(1000, 300000)
+
+    file.write("$ cd /\n")
+    write_session(file, root)
@@ -1,77 +1,54 @@
 """Day 08."""
 from __future__ import annotations
 
-import math
-from typing import TextIO
+from typing import Iterator, TextIO
 
 from result import Result
-from utils.geometry import Point2D
-from utils.parse import read_lines
-
-DIRECTIONS = [Point2D(0, 1), Point2D(1, 0), Point2D(0, -1), Point2D(-1, 0)]
-
-
-class Tree:
-    """A tree in the grid."""
-
-    def __init__(
-        self, grid: dict[Point2D, Tree], position: Point2D, height: int
-    ) -> None:
-        """Construct a new tree."""
-        self.height = height
-        self.position = position
-        self.grid = grid
-        self._visibility_memo: dict[Point2D, int] = {}
-
-    def max_height_in_direction(self, direction: Point2D) -> int:
-        """Get the height of the tallest tree in a given direction."""
-        if direction not in self._visibility_memo:
-            adjacent_tree = self.grid.get(self.position + direction)
-            if adjacent_tree is None:
-                self._visibility_memo[direction] = -1
-            else:
-                self._visibility_memo[direction] = max(
-                    adjacent_tree.height,
-                    adjacent_tree.max_height_in_direction(direction),
-                )
-
-        return self._visibility_memo[direction]
-
-    def is_visible(self) -> bool:
-        """Determine if this tree is visible from outside the grid."""
-        return self.height > min(
-            self.max_height_in_direction(dir) for dir in DIRECTIONS
-        )
-
-    def viewable_trees_in_direction(self, direction: Point2D) -> int:
-        """Determine viewable trees in a given direction."""
-        pos = self.position
-        total = 0
-        while True:
-            pos += direction
-            next_tree = self.grid.get(pos)
-            if next_tree is None:
-                break
-            total += 1
-            if next_tree.height >= self.height:
-                break
-        return total
-
-    def scenic_score(self) -> int:
-        """Compute the scenic score of a tree."""
-        return math.prod(self.viewable_trees_in_direction(dir) for dir in DIRECTIONS)
+from utils.grid import Grid
+from utils.parse import read_byte_grid
+
+
+def sight_lines(grid: Grid) -> Iterator[range]:
+    """Every row and column as flat indices, looking from each side of the grid."""
+    for y in range(grid.height):
+        yield grid.row_indices(y)
+        yield grid.row_indices(y)[::-1]
+    for x in range(grid.width):
+        yield grid.column_indices(x)
+        yield grid.column_indices(x)[::-1]
+
+
+def count_visible(grid: Grid) -> int:
+    """Count the trees that are visible from outside the grid."""
+    visible = bytearray(len(grid.data))
+    heights = grid.data
+    for line in sight_lines(grid):
+        tallest = -1
+        for i in line:
+            if heights[i] > tallest:
+                visible[i] = 1
+                tallest = heights[i]
+    return sum(visible)
+
+
+def best_scenic_score(grid: Grid) -> int:
+    """Find the highest scenic score of any tree."""
+    scores = [1] * len(grid.data)
+    heights = grid.data
+    for line in sight_lines(grid):
+        # Trees that can still block the view, as (height, distance along the line)
+        blockers: list[tuple[int, int]] = []
+        for distance, i in enumerate(line):
+            height = heights[i]
+            while blockers and blockers[-1][0] < height:
+                blockers.pop()
+            scores[i] *= distance - blockers[-1][1] if blockers else distance
+            blockers.append((height, distance))
+    return max(scores[i] for y in range(grid.height) for i in grid.row_indices(y))
 
 
 def run(file: TextIO) -> Result:
     """Solution for Day 08."""
-    grid: dict[Point2D, Tree] = {}
-    for y, row in enumerate(read_lines(file)):
-        for x, height in enumerate(row):
-            pos = Point2D(x, y)
-            tree = Tree(grid, pos, int(height))
-            grid[pos] = tree
-
-    part1 = sum(t.is_visible() for t in grid.values())
-    part2 = max(t.scenic_score() for t in grid.values())
+    grid = Grid.from_raw(read_byte_grid(file))
 
-    return Result(part1, part2)
+    return Result(lambda: count_visible(grid), lambda: best_scenic_score(grid))
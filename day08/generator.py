@@ -0,0 +1,11 @@
+"""Input generator for Day 08."""
+from random import Random
+from typing import TextIO
+
+DEFAULT_SCALE = 99
+
+
+def generate(file: TextIO, scale: int, rng: Random) -> None:
+    """Write a `scale` by `scale` grid of tree heights."""
+    for _ in range(scale):
+        file.write("".join(rng.choices("0123456789", k=scale)) + "\n")
@@ -0,0 +1,12 @@
+"""Input generator for Day 09."""
+from random import Random
+from typing import TextIO
+
+DEFAULT_SCALE = 2000
+
+
+def generate(file: TextIO, scale: int, rng: Random) -> None:
+    """Write `scale` head movements."""
+    file.writelines(
+        f"{rng.choice('RULD')} {rng.randint(1, 20)}\n" for _ in range(scale)
+    )
@@ -0,0 +1,17 @@
+"""Input generator for Day 10."""
+from random import Random
+from typing import TextIO
+
+DEFAULT_SCALE = 140
+
+
+def generate(file: TextIO, scale: int, rng: Random) -> None:
+    """Write `scale` instructions, keeping the register roughly on screen."""
+    register_x = 1
+    for _ in range(scale):
+        if rng.random() < 0.3:
+            file.write("noop\n")
+            continue
+        value = rng.randint(max(-15, -5 - register_x), min(15, 45 - register_x))
+        register_x += value
+        file.write(f"addx {value}\n")
@@ -117,6 +117,6 @@ def run(file: TextIO) -> Result:
     ]
 
     return Result(
-        run_rounds(monkeys, 20),
-        run_rounds(p2_monkeys, 10000),
+        lambda: run_rounds(monkeys, 20),
+        lambda: run_rounds(p2_monkeys, 10000),
     )
@@ -0,0 +1,41 @@
+"""Input generator for Day 11."""
+from random import Random
+from typing import TextIO
+
+DEFAULT_SCALE = 36
+PRIMES = [2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37]
+
+
+def operation(rng: Random, monkey_id: int) -> str:
+    """Pick a worry level operation, with exactly one monkey squaring."""
+    if monkey_id == 0:
+        return "old * old"
+    if rng.random() < 0.3:
+        return f"old * {rng.randint(2, 19)}"
+    return f"old + {rng.randint(1, 8)}"
+
+
+def generate(file: TextIO, scale: int, rng: Random) -> None:
+    """Write a group of monkeys holding `scale` items between them."""
+    monkeys = min(max(scale // 4, 2), len(PRIMES))
+    items: list[list[int]] = [[] for _ in range(monkeys)]
+    for i in range(max(scale, monkeys)):
+        holder = i if i < monkeys else rng.randrange(monkeys)
+        items[holder].append(rng.randint(50, 99))
+    divisors = rng.sample(PRIMES, monkeys)
+
+    for monkey_id in range(monkeys):
+        if monkey_id > 0:
+            file.write("\n")
+        others = [i for i in range(monkeys) if i != monkey_id]
+        true_monkey, false_monkey = (
+            rng.sample(others, 2) if len(others) > 1 else others * 2
+        )
+        file.write(
+            f"Monkey {monkey_id}:\n"
+            f"  Starting items: {', '.join(str(item) for item in items[monkey_id])}\n"
+            f"  Operation: new = {operation(rng, monkey_id)}\n"
+            f"  Test: divisible by {divisors[monkey_id]}\n"
+            f"    If true: throw to monkey {true_monkey}\n"
+            f"    If false: throw to monkey {false_monkey}\n"
+        )
@@ -1,67 +1,56 @@
 """Day 12."""
 
-from collections import deque
 from typing import Optional, TextIO
 
 from result import Result
-from utils.geometry import Point2D
-from utils.parse import read_lines
+from utils.grid import Grid
+from utils.parse import read_byte_grid
+from utils.search import bfs
 
 
 def climb(
-    start_pos: Point2D,
-    end_pos: Point2D,
-    height_map: dict[Point2D, int],
-    distances: dict[Point2D, int],
+    height_map: Grid, start: int, goals: bytearray, downhill: bool = False
 ) -> Optional[int]:
-    """Climb to the highest point."""
-    queue = deque([start_pos])
-    distances[start_pos] = 0
-
-    while queue:
-        curr_pos = queue.popleft()
-        curr_height = height_map[curr_pos]
-        curr_distance = distances[curr_pos]
-        for neighbour in curr_pos.neighbours():
-            height = height_map.get(neighbour)
-            if (
-                height is not None
-                and height <= curr_height + 1
-                and (
-                    neighbour not in distances
-                    or distances[neighbour] > curr_distance + 1
-                )
-            ):
-                queue.append(neighbour)
-                distances[neighbour] = curr_distance + 1
-                if neighbour == end_pos:
-                    return curr_distance + 1
-    # No path
-    return None
+    """Find the fewest steps from the start to any of the goals.
+
+    Going downhill retraces climbs in reverse, so it finds the nearest goal that can
+    climb up to the start.
+    """
+    heights = height_map.data
+    offsets = height_map.neighbour_offsets()
+
+    def steps(index: int) -> list[int]:
+        height = heights[index]
+        reachable = []
+        for offset in offsets:
+            neighbour = index + offset
+            climb_height = heights[neighbour] - height
+            if (-climb_height if downhill else climb_height) <= 1:
+                reachable.append(neighbour)
+        return reachable
+
+    # The border starts out visited so the search never steps off the map
+    visited = Grid(height_map.width, height_map.height, padding=1, border=1).data
+    found = bfs([start], steps, is_goal=lambda i: goals[i] != 0, visited=visited)
+    return None if found is None else found[1]
 
 
 def run(file: TextIO) -> Result:
     """Solution for Day 12."""
-    height_map = {}
-
-    for y, row in enumerate(read_lines(file)):
-        for x, c in enumerate(row):
-            pos = Point2D(x, y)
-            match c:
-                case "S":
-                    height = ord("a")
-                    start_pos = pos
-                case "E":
-                    height = ord("z")
-                    end_pos = pos
-                case v:
-                    height = ord(v)
-            height_map[pos] = height
-
-    distances: dict[Point2D, int] = {}
-    part1 = climb(start_pos, end_pos, height_map, distances)
-    p2_start_points = [pos for pos, height in height_map.items() if height == ord("a")]
-    p2_climbs = [climb(pos, end_pos, height_map, distances) for pos in p2_start_points]
-    part2 = min(p for p in p2_climbs if p is not None)
+    height_map = Grid.from_raw(read_byte_grid(file), padding=1)
+    start = height_map.index(*height_map.find(ord("S")))
+    end = height_map.index(*height_map.find(ord("E")))
+    height_map.data[start] = ord("a")
+    height_map.data[end] = ord("z")
+
+    def part1() -> Optional[int]:
+        goals = bytearray(len(height_map.data))
+        goals[end] = 1
+        return climb(height_map, start, goals)
+
+    def part2() -> Optional[int]:
+        lowest = bytearray(256)
+        lowest[ord("a")] = 1
+        return climb(height_map, end, height_map.data.translate(lowest), downhill=True)
 
     return Result(part1, part2)
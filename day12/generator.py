@@ -0,0 +1,32 @@
+"""Input generator for Day 12."""
+from random import Random
+from typing import TextIO
+
+DEFAULT_SCALE = 80
+MIN_SCALE = 30
+
+
+def generate(file: TextIO, scale: int, rng: Random) -> None:
+    """Write a `scale` by `scale` heightmap with a route from the start to the end.
+
+    Heights rise by one per step towards the end, capped by the distance from the start,
+    with random dips everywhere except along the start's row and the end's column.
+    """
+    size = max(scale, MIN_SCALE)
+    start_x, start_y = 0, rng.randrange(size)
+    end_x, end_y = rng.randint(max(size // 2, 26), size - 1), rng.randrange(size)
+    for y in range(size):
+        row = []
+        for x in range(size):
+            height = min(
+                25 - min(abs(x - end_x) + abs(y - end_y), 25),
+                abs(x - start_x) + abs(y - start_y),
+            )
+            if y != start_y and x != end_x and rng.random() < 0.3:
+                height = max(height - rng.randint(1, 5), 0)
+            row.append(chr(ord("a") + height))
+        if y == start_y:
+            row[start_x] = "S"
+        if y == end_y:
+            row[end_x] = "E"
+        file.write("".join(row) + "\n")
@@ -0,0 +1,42 @@
+"""Input generator for Day 13."""
+from __future__ import annotations
+
+from random import Random
+from typing import TextIO, Union
+
+DEFAULT_SCALE = 150
+
+PacketData = Union[int, list["PacketData"]]
+
+
+def random_packet(rng: Random, depth: int = 0) -> list[PacketData]:
+    """Build a random packet, nesting lists at most four deep."""
+    return [
+        random_packet(rng, depth + 1)
+        if depth < 4 and rng.random() < 0.3
+        else rng.randint(0, 10)
+        for _ in range(rng.randint(0, 5))
+    ]
+
+
+def mutate(rng: Random, packet: list[PacketData]) -> list[PacketData]:
+    """Copy a packet, changing a single value so the pair only differs late on."""
+    result = [mutate(rng, item) if isinstance(item, list) else item for item in packet]
+    if result and rng.random() < 0.5:
+        result[-1] = rng.randint(0, 10)
+    return result
+
+
+def format_packet(packet: PacketData) -> str:
+    """Format a packet the way it appears in the input."""
+    return str(packet).replace(" ", "")
+
+
+def generate(file: TextIO, scale: int, rng: Random) -> None:
+    """Write `scale` pairs of packets."""
+    for i in range(scale):
+        if i > 0:
+            file.write("\n")
+        left = random_packet(rng)
+        right = mutate(rng, left) if rng.random() < 0.5 else random_packet(rng)
+        file.write(f"{format_packet(left)}\n{format_packet(right)}\n")
@@ -1,80 +1,73 @@
 """Day 14."""
 
-from enum import Enum
 from itertools import count, pairwise
 from typing import Optional, TextIO
 
 from result import Result
 from utils.geometry import Point2D
+from utils.grid import Grid
 from utils.parse import read_lines
 
+ROCK, EMPTY, SAND = b"#.O"
 
-class Cell(Enum):
-    """The value in a cell."""
-
-    ROCK = "#"
-    EMPTY = "."
-    SAND = "O"
-
-
-MOVEMENT_CHOICES = [Point2D(0, 1), Point2D(-1, 1), Point2D(1, 1)]
 ENTRY_POINT = Point2D(500, 0)
 
 
-def format_grid(grid: dict[Point2D, Cell]) -> str:
-    """String format the grid."""
-    min_x = min(grid.keys(), key=lambda p: p.x).x
-    max_x = max(grid.keys(), key=lambda p: p.x).x
-    min_y = 0
-    max_y = max(grid.keys(), key=lambda p: p.y).y
+def format_grid(grid: Grid) -> str:
+    """String format the grid above the floor, trimmed to the columns in use."""
+    rows = str(grid).split("\n")[:-1]
+    used = [x for x in range(grid.width) if grid.column(x)[:-1].strip(b".")]
+    return "\n".join(row[used[0] : used[-1] + 1] for row in rows)
 
-    result = []
-    for y in range(min_y, max_y + 1):
-        result.append(
-            "".join(
-                grid.get(Point2D(x, y), Cell.EMPTY).value
-                for x in range(min_x, max_x + 1)
-            )
-        )
-    return "\n".join(result)
 
+def drop_sand(grid: Grid, entry: int, abyss: Optional[int] = None) -> bool:
+    """Drop sand in the grid.  Return True if it falls into the abyss or reaches 500, 0.
 
-def drop_sand(
-    grid: dict[Point2D, Cell],
-    abyss_point: Optional[int] = None,
-    floor: Optional[int] = None,
-) -> bool:
-    """Drop sand in the grid.  Return True if it falls into the abyss or reaches 500, 0."""
-    p = ENTRY_POINT
+    Positions are flat indices, so anything at or past the `abyss` index is in the abyss.
+    """
+    cells = grid.data
+    below = grid.stride
+    movement_choices = [below, below - 1, below + 1]
+    p = entry
     while True:
-        if abyss_point is not None and p.y >= abyss_point:
+        if abyss is not None and p >= abyss:
             return True
-        for offset in MOVEMENT_CHOICES:
-            if grid.get(p + offset) is None and (floor is None or p.y < floor):
+        for offset in movement_choices:
+            if cells[p + offset] == EMPTY:
                 p += offset
                 break
         else:
             break
-    grid[p] = Cell.SAND
-    if p == ENTRY_POINT:
-        return True
-    return False
+    cells[p] = SAND
+    return p == entry
 
 
 def run(file: TextIO) -> Result:
     """Solution for Day 14."""
-    grid = {}
+    rocks: set[Point2D] = set()
     for line in read_lines(file):
         for start, end in pairwise(Point2D.parse(x) for x in line.split(" -> ")):
-            for p in start.points_between(end):
-                grid[p] = Cell.ROCK
-    abyss_point = max(grid.keys(), key=lambda p: p.y).y
+            rocks.update(start.points_between(end))
+    abyss_point = max(p.y for p in rocks)
+    floor = abyss_point + 2
+
+    # Sand can't spread further sideways than the floor is deep
+    min_x = min(min(p.x for p in rocks), ENTRY_POINT.x - floor)
+    max_x = max(max(p.x for p in rocks), ENTRY_POINT.x + floor)
+    grid = Grid(max_x - min_x + 1, floor + 1, fill=EMPTY)
+    for p in rocks:
+        grid[p.x - min_x, p.y] = ROCK
+    for x in range(grid.width):
+        grid[x, floor] = ROCK
+
+    entry = grid.index(ENTRY_POINT.x - min_x, ENTRY_POINT.y)
+    abyss = grid.index(0, abyss_point)
     print(format_grid(grid))
     for part1 in count():
-        if drop_sand(grid, abyss_point):
+        if drop_sand(grid, entry, abyss):
             break
     for part2 in count(part1 + 1):
-        if drop_sand(grid, floor=abyss_point + 1):
+        if drop_sand(grid, entry):
             break
     print(format_grid(grid))
 
@@ -0,0 +1,24 @@
+"""Input generator for Day 14."""
+from random import Random
+from typing import TextIO
+
+DEFAULT_SCALE = 150
+
+
+def generate(file: TextIO, scale: int, rng: Random) -> None:
+    """Write `scale` paths of rock, spread over a cave about `scale` deep."""
+    depth = max(scale, 20)
+    for _ in range(scale):
+        x, y = rng.randint(500 - depth // 2, 500 + depth // 2), rng.randint(5, depth)
+        points = [(x, y)]
+        horizontal = rng.random() < 0.5
+        for _ in range(rng.randint(1, 5)):
+            length = rng.choice([-1, 1]) * rng.randint(1, 8)
+            if horizontal:
+                x += length
+            else:
+                y = max(y + length, 5)
+            if (x, y) != points[-1]:
+                points.append((x, y))
+            horizontal = not horizontal
+        file.write(" -> ".join(f"{x},{y}" for x, y in points) + "\n")
@@ -1,16 +1,30 @@
 """Day 15."""
 from __future__ import annotations
 
-import re
-from typing import Optional, TextIO
+from bisect import bisect_left, bisect_right
+from typing import Iterable, Iterator, NamedTuple, Optional, TextIO
 
 from result import Result
 from utils.geometry import Point2D
-from utils.parse import read_lines
+from utils.intervals import Interval, IntervalSet, IntervalTree
+from utils.parse import read_int_table
 
-regex = re.compile(
-    r"Sensor at x=(-?\d*), y=(-?\d*): closest beacon is at x=(-?\d*), y=(-?\d*)"
-)
+
+class Diagonal(NamedTuple):
+    """A segment of the line y = slope * x + intercept, where slope is 1 or -1."""
+
+    slope: int
+    intercept: int
+    xs: Interval
+
+    def y_at(self, x: int) -> Optional[int]:
+        """Get the y coordinate of the segment at some x, if it reaches that far."""
+        return self.slope * x + self.intercept if self.xs.contains_point(x) else None
+
+    def x_at(self, y: int) -> Optional[int]:
+        """Get the x coordinate of the segment at some y, if it reaches that far."""
+        x = (y - self.intercept) * self.slope
+        return x if self.xs.contains_point(x) else None
 
 
 class Sensor:
@@ -22,16 +36,9 @@ class Sensor:
         self.beacon_position = beacon_position
         self.manhattan_radius = position.manhattan_distance(beacon_position)
 
-    @staticmethod
-    def from_string(s: str) -> Sensor:
-        """Parse a sensor from input."""
-        match = regex.match(s)
-        assert match is not None
-        point_data = match.groups()
-        return Sensor(
-            Point2D(int(point_data[0]), int(point_data[1])),
-            Point2D(int(point_data[2]), int(point_data[3])),
-        )
+    def covers(self, point: Point2D) -> bool:
+        """Check if this sensor covers a point."""
+        return self.position.manhattan_distance(point) <= self.manhattan_radius
 
     def coverage_on_line(self, y: int) -> Optional[tuple[int, int]]:
         """Compute the start and and point that this sensor covers on a line."""
@@ -41,21 +48,33 @@ class Sensor:
         width = self.manhattan_radius - height
         return (self.position.x - width, self.position.x + width)
 
+    def lines_covered(self) -> Interval:
+        """Compute the lines that this sensor covers any of."""
+        return Interval(
+            self.position.y - self.manhattan_radius,
+            self.position.y + self.manhattan_radius,
+        )
+
+    def boundary(self, distance: int = 1) -> list[Diagonal]:
+        """Get the four edges of the diamond some distance out of this sensor's range."""
+        x, y = self.position
+        reach = self.manhattan_radius + distance
+        left, right = Interval(x - reach, x), Interval(x, x + reach)
+        return [
+            Diagonal(1, y - x + reach, left),
+            Diagonal(1, y - x - reach, right),
+            Diagonal(-1, x + y - reach, left),
+            Diagonal(-1, x + y + reach, right),
+        ]
+
 
-def collapse_coverage(sensors: list[Sensor], line: int) -> list[tuple[int, int]]:
+def collapse_coverage(sensors: Iterable[Sensor], line: int) -> IntervalSet:
     """Collapse the coverage down to a minimum set of intervals."""
-    coverage = [sensor.coverage_on_line(line) for sensor in sensors]
-    sorted_coverage = sorted(c for c in coverage if c is not None)
-    if len(sorted_coverage) == 0:
-        return []
-    collapsed = [sorted_coverage[0]]
-    for start, end in sorted_coverage[1:]:
-        existing_start, existing_end = collapsed[-1]
-        if start > existing_end + 1:
-            collapsed.append((start, end))
-        else:
-            collapsed[-1] = (existing_start, max(existing_end, end))
-    return collapsed
+    return IntervalSet(
+        coverage
+        for sensor in sensors
+        if (coverage := sensor.coverage_on_line(line)) is not None
+    )
 
 
 def coverage_on_line(sensors: list[Sensor], line: int) -> int:
@@ -67,28 +86,77 @@ def coverage_on_line(sensors: list[Sensor], line: int) -> int:
         for sensor in sensors
         if sensor.beacon_position.y == line
     }
-    beacons_covered = len(
-        [
-            x
-            for x in unique_beacons_on_line
-            if any(start <= x <= end for (start, end) in collapsed)
-        ]
+    beacons_covered = sum(x in collapsed for x in unique_beacons_on_line)
+    return collapsed.total_length() - beacons_covered
+
+
+def crossings(diagonals: list[Diagonal]) -> Iterator[Point2D]:
+    """Find the points where rising and falling diagonals cross."""
+    rising = sorted(
+        (diagonal for diagonal in diagonals if diagonal.slope == 1),
+        key=lambda diagonal: diagonal.intercept,
     )
-    return sum(end - start + 1 for start, end in collapsed) - beacons_covered
+    intercepts = [diagonal.intercept for diagonal in rising]
+    for falling in diagonals:
+        if falling.slope == 1:
+            continue
+        # -x + p = x + q crosses at x = (p - q) / 2, which must be inside the segment
+        lowest = bisect_left(intercepts, falling.intercept - 2 * falling.xs.end)
+        highest = bisect_right(intercepts, falling.intercept - 2 * falling.xs.start)
+        for other in rising[lowest:highest]:
+            x, odd = divmod(falling.intercept - other.intercept, 2)
+            if not odd and other.xs.contains_point(x):
+                yield Point2D(x, falling.intercept - x)
+
+
+def border_crossings(diagonals: list[Diagonal], max_coord: int) -> Iterator[Point2D]:
+    """Find the points where diagonals cross the edges of the search area."""
+    yield from (Point2D(x, y) for x in (0, max_coord) for y in (0, max_coord))
+    for diagonal in diagonals:
+        for edge in (0, max_coord):
+            if (y := diagonal.y_at(edge)) is not None:
+                yield Point2D(edge, y)
+            if (x := diagonal.x_at(edge)) is not None:
+                yield Point2D(x, edge)
 
 
 def find_space(sensors: list[Sensor], max_coord: int) -> Point2D:
-    """Find the beacon."""
-    for y in range(max_coord + 1):
-        coverage = collapse_coverage(sensors, y)
-        if len(coverage) != 1:
-            return Point2D(coverage[0][1] + 1, y)
+    """Find the only space in the search area that no sensor covers.
+
+    Stepping from a covered point to the space takes it one or two further from the
+    sensor covering that point, depending on whether the step is straight or diagonal.
+    If the space isn't on the edge of the search area, its straight and diagonal
+    neighbours are all covered, and in each diagonal direction some sensor's diamond one
+    or two out of range has an edge across that direction through the space.  So the
+    space is where two of those edges cross.  Otherwise it's where the edge of a diamond
+    just out of range meets the edge of the search area, or in a corner.  Only those
+    points are checked.
+    """
+    sensor_tree = IntervalTree((sensor.lines_covered(), sensor) for sensor in sensors)
+    just_out = [diagonal for sensor in sensors for diagonal in sensor.boundary(1)]
+    two_out = [diagonal for sensor in sensors for diagonal in sensor.boundary(2)]
+    candidates = (
+        *crossings(just_out + two_out),
+        *border_crossings(just_out, max_coord),
+    )
+    for point in candidates:
+        if not (0 <= point.x <= max_coord and 0 <= point.y <= max_coord):
+            continue
+        if not any(sensor.covers(point) for sensor in sensor_tree.stab(point.y)):
+            return point
     raise Exception("Beacon not found")
 
 
 def run(file: TextIO) -> Result:
     """Solution for Day 15."""
-    sensors = [Sensor.from_string(line) for line in read_lines(file)]
-    p2 = find_space(sensors, 4000000)
+    # Each row is a sensor's x and y, then its beacon's
+    sensors = [
+        Sensor(Point2D(x, y), Point2D(beacon_x, beacon_y))
+        for x, y, beacon_x, beacon_y in read_int_table(file, 4).rows()
+    ]
+
+    def part2() -> int:
+        beacon = find_space(sensors, 4000000)
+        return 4000000 * beacon.x + beacon.y
 
-    return Result(coverage_on_line(sensors, 2000000), 4000000 * p2.x + p2.y)
+    return Result(lambda: coverage_on_line(sensors, 2000000), part2)
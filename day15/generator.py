@@ -0,0 +1,41 @@
+"""Input generator for Day 15."""
+from math import isqrt
+from random import Random
+from typing import TextIO
+
+DEFAULT_SCALE = 30
+SEARCH_SIZE = 4000000
+
+
+def distance(x1: int, y1: int, x2: int, y2: int) -> int:
+    """Compute the manhattan distance between two points."""
+    return abs(x1 - x2) + abs(y1 - y2)
+
+
+def generate(file: TextIO, scale: int, rng: Random) -> None:
+    """Write about `scale` sensors leaving exactly one uncovered spot in the search area.
+
+    Sensors sit on a square lattice spanning the search area, each reaching at least
+    twice the lattice spacing but stopping just short of a hidden spot inside one of the
+    cells.  Any other point has a sensor within one spacing of it on the far side from
+    the hidden spot, which must then cover it.
+    """
+    points = max(isqrt(scale), 4)
+    spacing = -(SEARCH_SIZE // -(points - 3))
+    hidden_x, hidden_y = rng.randint(0, SEARCH_SIZE), rng.randint(0, SEARCH_SIZE)
+    while hidden_x % spacing == 0 or hidden_y % spacing == 0:
+        hidden_x, hidden_y = rng.randint(0, SEARCH_SIZE), rng.randint(0, SEARCH_SIZE)
+
+    for i in range(points):
+        for j in range(points):
+            sensor_x, sensor_y = (i - 1) * spacing, (j - 1) * spacing
+            reach = min(
+                2 * spacing + rng.randint(0, spacing // 2),
+                distance(sensor_x, sensor_y, hidden_x, hidden_y) - 1,
+            )
+            offset_x = rng.randint(-reach, reach)
+            offset_y = rng.choice([-1, 1]) * (reach - abs(offset_x))
+            file.write(
+                f"Sensor at x={sensor_x}, y={sensor_y}: closest beacon is at "
+                f"x={sensor_x + offset_x}, y={sensor_y + offset_y}\n"
+            )
@@ -0,0 +1,20 @@
+"""Tests for Day 15."""
+from day15.day15 import Sensor, find_space
+from utils.geometry import Point2D
+
+
+def test_find_space_between_collinear_edges() -> None:
+    """The space can sit between two sensors' edges with no other edge crossing it."""
+    sensors = [
+        Sensor(Point2D(x, y), Point2D(beacon_x, beacon_y))
+        for x, y, beacon_x, beacon_y in [
+            (12, 8, 7, 4),
+            (3, 2, 5, 3),
+            (0, 5, 0, 5),
+            (12, 7, 10, 14),
+            (2, 12, -4, 9),
+            (-2, 3, -1, 9),
+            (9, 0, 9, -6),
+        ]
+    ]
+    assert find_space(sensors, 9) == Point2D(5, 4)
@@ -1,73 +1,191 @@
 """Day 16."""
 
 import re
-from collections import deque
 from typing import TextIO
 
 from result import Result
+from utils.bitset import Alphabet, iter_bits, popcount, subset_max
+from utils.instrument import count
 from utils.parse import read_lines
+from utils.search import bfs
 
 regex = re.compile(
     r"Valve (?P<valve>\S*) .* rate=(?P<rate>\d*); .* valve(s)? (?P<neighbours>.*)"
 )
 
+START = "AA"
+# Longer than any time limit, for valves that can't be reached at all
+UNREACHABLE = 1 << 30
+
 
 class Grid:
-    """A grid class to handle connections."""
-
-    def __init__(
-        self, connections: dict[str, dict[str, int]], rates: dict[str, int]
-    ) -> None:
-        """Construct a grid."""
-        self.connections = connections
-        self.rates = rates
-
-    def release_pressure(
-        self,
-        current_node: str,
-        time_left: int,
-        pressure_released: int,
-        released: frozenset[str],
-    ) -> dict[frozenset[str], int]:
-        """Find all possible pressure releases."""
-        if time_left <= 0:
-            return {}
-        pressure_released += self.rates[current_node] * time_left
-
-        new_released = released | {current_node}
-        result = {new_released: pressure_released}
-
-        for new_node, cost in self.connections[current_node].items():
-            if new_node in new_released:
-                continue
-            for key, value in self.release_pressure(
-                new_node, time_left - cost - 1, pressure_released, new_released
-            ).items():
-                result[key] = max(result.get(key, 0), value)
-
-        return result
-
-
-def compute_relevant_connections(
-    start: str, connections: dict[str, list[str]], rates: dict[str, int]
-) -> dict[str, int]:
-    """Compute the distance to nodes of interest."""
-    interesting_nodes = {}
-    visited = {start}
-    to_visit = deque([(node, 1) for node in connections[start]])
-    while to_visit:
-        current_node, distance = to_visit.popleft()
-        visited.add(current_node)
-        if rates[current_node] > 0:
-            interesting_nodes[current_node] = distance
-        to_visit.extend(
-            [
-                (node, distance + 1)
-                for node in connections[current_node]
-                if node not in visited
-            ]
+    """The working valves and the distances between them.
+
+    Valves are numbered by their bit in `valves`, so sets of opened valves are bitmasks.
+    The start is numbered after them if it isn't a working valve itself.
+    """
+
+    def __init__(self, neighbours: dict[str, list[str]], rates: dict[str, int]) -> None:
+        """Construct a grid from the tunnels leading out of each valve."""
+        working = [valve for valve, rate in rates.items() if rate > 0]
+        self.valves = Alphabet(working)
+        self.rates = [rates[valve] for valve in working]
+        sources = working if START in self.valves.bits else working + [START]
+        self.start = sources.index(START)
+        self.distances = [
+            compute_distances(source, neighbours, working) for source in sources
+        ]
+        # The valves that can be reached from each valve, nearest first, with the time
+        # taken to reach and open each, its number, bit and rate
+        self.moves = [
+            sorted(
+                (distance + 1, i, 1 << i, self.rates[i])
+                for i, distance in enumerate(distances)
+                if distance != UNREACHABLE
+            )
+            for distances in self.distances
+        ]
+
+    def release_pressure(self, time: int) -> list[int]:
+        """Find the most pressure that can be released by opening each set of valves.
+
+        The result is indexed by bitmask, with 0 for sets that can't all be opened in
+        time.  States of (valve, time left, opened) are memoised with the most pressure
+        they've been reached with, so any path reaching one with no more is dropped.
+        """
+        best = [0] * (1 << len(self.valves))
+        seen: dict[tuple[int, int, int], int] = {}
+        stack = [(self.start, time, 0, 0)]
+        while stack:
+            valve, time_left, opened, pressure = stack.pop()
+            if pressure > best[opened]:
+                best[opened] = pressure
+            for cost, next_valve, bit, rate in self.moves[valve]:
+                next_time_left = time_left - cost
+                if next_time_left <= 0:
+                    break  # Every other valve is further away
+                if opened & bit:
+                    continue
+                state = (next_valve, next_time_left, opened | bit)
+                next_pressure = pressure + rate * next_time_left
+                if seen.get(state, -1) >= next_pressure:
+                    continue
+                seen[state] = next_pressure
+                stack.append((*state, next_pressure))
+        count("day16.states", len(seen))
+        return best
+
+    def max_pressure(self, agents: int, time: int) -> int:
+        """Find the most pressure that some agents working together can release.
+
+        The agents open disjoint sets of valves, so each can be given a set and the best
+        found for it by `release_pressure`.  The last two agents split the valves left
+        between them in the best way, which is worked out once for each set of valves
+        left.  The others are given sets in order of how much they release, keeping only
+        sets that release more than any of their subsets.  A set is skipped if the other
+        agents couldn't make up the difference even with the best bounds to hand: no
+        more than it each, or the best of the valves left each, or each valve left opened
+        as soon as it could be reached from the start.
+        """
+        if agents < 1:
+            raise ValueError("There must be at least one agent")
+        best = self.release_pressure(time)
+        best_within = subset_max(best)
+        full = self.valves.full
+        if agents == 1:
+            return best_within[full]
+
+        candidates = sorted(
+            (
+                (pressure, opened)
+                for opened, pressure in enumerate(best)
+                if pressure
+                and all(
+                    best_within[opened ^ (1 << i)] < pressure for i in iter_bits(opened)
+                )
+            ),
+            reverse=True,
         )
-    return interesting_nodes
+        pairs: dict[int, int] = {}
+
+        def best_pair(closed: int) -> int:
+            """Find the most two agents can release, opening only valves in a set."""
+            if closed in pairs:
+                return pairs[closed]
+            result = best_within[closed]
+            if 1 << popcount(closed) < len(candidates):
+                opened = closed
+                while opened:
+                    pressure = best[opened] + best_within[closed ^ opened]
+                    if pressure > result:
+                        result = pressure
+                    opened = (opened - 1) & closed
+            else:
+                for value, opened in candidates:
+                    if 2 * value <= result:
+                        break  # The bigger set of the two must be one already seen
+                    if opened & closed == opened:
+                        pressure = value + best_within[closed ^ opened]
+                        if pressure > result:
+                            result = pressure
+            pairs[closed] = result
+            return result
+
+        if agents == 2:
+            return best_pair(full)
+
+        earliest = [
+            rate * max(time - distance - 1, 0)
+            for rate, distance in zip(self.rates, self.distances[self.start])
+        ]
+        potential = [0] * (full + 1)
+        for mask in range(1, full + 1):
+            lowest = mask & -mask
+            potential[mask] = (
+                potential[mask ^ lowest] + earliest[lowest.bit_length() - 1]
+            )
+        answer = 0
+
+        def search(
+            agents_left: int,
+            candidates: list[tuple[int, int]],
+            closed: int,
+            pressure: int,
+        ) -> None:
+            nonlocal answer
+            # Leave the rest to one agent, in case there aren't enough sets to go round
+            answer = max(answer, pressure + best_within[closed])
+            others = agents_left - 1
+            for i, (value, opened) in enumerate(candidates):
+                if pressure + agents_left * value <= answer:
+                    break  # Every other set releases no more
+                rest = closed ^ opened
+                bound = min(others * value, others * best_within[rest], potential[rest])
+                if pressure + value + bound <= answer:
+                    continue
+                if others == 2:
+                    answer = max(answer, pressure + value + best_pair(rest))
+                    continue
+                # Later sets release no more, so this agent's set is the biggest
+                subsets = [
+                    (other_value, other)
+                    for other_value, other in candidates[i + 1 :]
+                    if other & rest == other
+                ]
+                search(others, subsets, rest, pressure + value)
+
+        search(agents, candidates, full, 0)
+        count("day16.pair_sets", len(pairs))
+        return answer
+
+
+def compute_distances(
+    start: str, neighbours: dict[str, list[str]], targets: list[str]
+) -> list[int]:
+    """Compute the distances from one valve to each of the targets."""
+    distances: dict[str, int] = {}
+    bfs([start], neighbours.__getitem__, distances=distances)
+    return [distances.get(target, UNREACHABLE) for target in targets]
 
 
 def run(file: TextIO) -> Result:
@@ -82,20 +200,13 @@ def run(file: TextIO) -> Result:
         rates[valve] = int(rate)
         neighbours[valve] = match.group("neighbours").split(", ")
 
-    connections = {
-        node: compute_relevant_connections(node, neighbours, rates)
-        for node in neighbours
-    }
-
-    grid = Grid(connections, rates)
-    pressure_release_values = grid.release_pressure("AA", 30, 0, frozenset())
-    pressure_release_values_part2 = grid.release_pressure("AA", 26, 0, frozenset())
-
-    part1 = max(pressure_release_values.values())
-    part2 = max(
-        v1 + v2
-        for k1, v1 in pressure_release_values_part2.items()
-        for k2, v2 in pressure_release_values_part2.items()
-        if k1.intersection(k2) == frozenset(["AA"])
-    )
+    grid = Grid(neighbours, rates)
+
+    def part1() -> int:
+        return grid.max_pressure(1, 30)
+
+    def part2() -> int:
+        # You and the elephant
+        return grid.max_pressure(2, 26)
+
     return Result(part1, part2)
@@ -0,0 +1,38 @@
+"""Input generator for Day 16."""
+import string
+from itertools import product
+from random import Random
+from typing import TextIO
+
+DEFAULT_SCALE = 60
+START = "AA"
+
+
+def generate(file: TextIO, scale: int, rng: Random) -> None:
+    """Write a connected network of `scale` valves, about a quarter of them working."""
+    names = ["".join(name) for name in product(string.ascii_uppercase, repeat=2)]
+    names.remove(START)
+    names = [START] + rng.sample(names, min(max(scale, 2), len(names) + 1) - 1)
+
+    tunnels: dict[str, set[str]] = {name: set() for name in names}
+    edges = [(name, rng.choice(names[:i])) for i, name in enumerate(names) if i > 0]
+    for _ in range(len(names) // 5):
+        left, right = rng.sample(names, 2)
+        edges.append((left, right))
+    for left, right in edges:
+        tunnels[left].add(right)
+        tunnels[right].add(left)
+
+    working = set(rng.sample(names[1:], max(round(len(names) / 4), 1)))
+    lines = []
+    for name in names:
+        rate = rng.randint(1, 25) if name in working else 0
+        neighbours = sorted(tunnels[name])
+        tunnel_text = (
+            "tunnels lead to valves" if len(neighbours) > 1 else "tunnel leads to valve"
+        )
+        lines.append(
+            f"Valve {name} has flow rate={rate}; {tunnel_text} {', '.join(neighbours)}\n"
+        )
+    rng.shuffle(lines)
+    file.writelines(lines)
@@ -1,11 +1,11 @@
 """Day 17."""
 from __future__ import annotations
 
-from itertools import cycle
 from typing import Optional, TextIO
 
 from result import Result
 from utils.geometry import Point2D
+from utils.instrument import count
 
 HORZONTAL_LINE_SHAPE = {Point2D(0, 0), Point2D(1, 0), Point2D(2, 0), Point2D(3, 0)}
 PLUS_SHAPE = {Point2D(1, 0), Point2D(0, 1), Point2D(1, 1), Point2D(2, 1), Point2D(1, 2)}
@@ -14,30 +14,38 @@ VERTICAL_LINE_SHAPE = {Point2D(0, 0), Point2D(0, 1), Point2D(0, 2), Point2D(0, 3
 BOX_SHAPE = {Point2D(0, 0), Point2D(1, 0), Point2D(0, 1), Point2D(1, 1)}
 
 CHAMBER_WIDTH = 7
+# Rocks appear this far from the left wall, and this far above the highest rock
+START_X = 2
+START_GAP = 3
+# Rows are masks with a bit per column, so a full row also makes a floor
+FULL_ROW = (1 << CHAMBER_WIDTH) - 1
+# Shapes are checked against this many rows at once, which fits any of them
+WINDOW = 4
+# Cycles are found by comparing this many rows at the top of the chamber, which rocks are
+# assumed never to fall below
+MAX_DEPTH = 100
 
 SHAPES = [HORZONTAL_LINE_SHAPE, PLUS_SHAPE, L_SHAPE, VERTICAL_LINE_SHAPE, BOX_SHAPE]
+JETS = {"<": -1, ">": 1}
 
 
 class Rock:
-    """A falling rock."""
+    """A rock shape as masks of its rows, shifted to each column it can be at."""
 
-    def __init__(self, initial_height: int, shape: set[Point2D]) -> None:
-        """Construct a new rock."""
-        self.position = {p + Point2D(2, initial_height) for p in shape}
+    def __init__(self, shape: set[Point2D]) -> None:
+        """Construct a rock from the points of its shape."""
+        self.height = max(p.y for p in shape) + 1
+        self.max_x = CHAMBER_WIDTH - max(p.x for p in shape) - 1
+        rows = [sum(1 << p.x for p in shape if p.y == y) for y in range(self.height)]
+        self.rows = [[row << x for row in rows] for x in range(self.max_x + 1)]
+        # The rows packed a byte each into an int, lowest first, to test a whole window
+        # of the chamber at once
+        self.packed = [
+            int.from_bytes(bytes(shifted), "little") for shifted in self.rows
+        ]
 
-    def move(
-        self,
-        movement: Point2D,
-        occupied_positions: set[Point2D],
-    ) -> bool:
-        """Move the rock."""
-        new_position = {p + movement for p in self.position}
-        if any(p.x < 0 or p.x >= CHAMBER_WIDTH or p.y < 0 for p in new_position):
-            return False
-        if not new_position.isdisjoint(occupied_positions):
-            return False
-        self.position = new_position
-        return True
+
+ROCKS = [Rock(shape) for shape in SHAPES]
 
 
 class CycleDetector:
@@ -45,23 +53,22 @@ class CycleDetector:
 
     def __init__(self) -> None:
         """Create a cycle detector."""
-        self.recordings: dict[tuple[frozenset[Point2D], int, int], tuple[int, int]] = {}
+        self.recordings: dict[tuple[bytes, int, int], tuple[int, int]] = {}
 
     def check_cycle(
         self,
-        occupied_spaces: set[Point2D],
+        top_rows: bytes,
         jet_offset: int,
         rock_offset: int,
         rock_number: int,
         height: int,
     ) -> Optional[tuple[int, int]]:
-        """Check for a cycle."""
-        min_occupied_space = min(p.y for p in occupied_spaces)
-        occupied_spaces_shifted = frozenset(
-            {p - Point2D(0, min_occupied_space) for p in occupied_spaces}
-        )
-        key = (occupied_spaces_shifted, jet_offset, rock_offset)
+        """Check for a cycle, returning how many rocks and rows it adds if found.
 
+        The top rows are the top `MAX_DEPTH` rows of the chamber, so that holes and
+        overhangs under the highest rocks count too.
+        """
+        key = (top_rows, jet_offset, rock_offset)
         if key in self.recordings:
             old_height, old_rock_number = self.recordings[key]
             return rock_number - old_rock_number, height - old_height
@@ -70,61 +77,75 @@ class CycleDetector:
 
 
 def drop_rocks(jet_pattern: str, number: int) -> int:
-    """Drop rocks and return the height reached."""
-    jet_patterns = cycle(enumerate(jet_pattern))
-    rock_shapes = cycle(enumerate(SHAPES))
-    occupied_positions: set[Point2D] = set()
-    cycle_detector = CycleDetector()
-    rock_number = 0
+    """Drop rocks and return the height reached.
+
+    The chamber is a bytearray of row masks, with a full row at the bottom as the floor,
+    so checking whether a rock fits is a single and of its packed rows with the window
+    of rows it would cover.
+    """
+    try:
+        jets = [JETS[jet] for jet in jet_pattern]
+    except KeyError as e:
+        raise Exception(f"Invalid jet pattern {e.args[0]}") from None
+    chamber = bytearray([FULL_ROW])
+    cycle_detector: Optional[CycleDetector] = CycleDetector()
+    jet_offset = 0
     height = 0
-
-    while True:
-        rock_offset, shape = next(rock_shapes)
-        rock = Rock(height + 3, shape)
+    skipped_height = 0
+    rock_number = 0
+    dropped = 0
+
+    while rock_number < number:
+        rock_offset = rock_number % len(ROCKS)
+        rock = ROCKS[rock_offset]
+        # Nothing is in the way until the rock reaches the top of the chamber, so only
+        # the walls matter for the first few pushes
+        x = START_X
+        for _ in range(START_GAP + 1):
+            x = min(max(x + jets[jet_offset], 0), rock.max_x)
+            jet_offset = (jet_offset + 1) % len(jets)
+        # The row of the chamber that the bottom of the rock is in, counting the floor
+        y = height + 1
+        chamber.extend(bytes(y + WINDOW - len(chamber)))
         while True:
-            jet_offset, jet_char = next(jet_patterns)
-            match jet_char:
-                case ">":
-                    rock.move(Point2D(1, 0), occupied_positions)
-                case "<":
-                    rock.move(Point2D(-1, 0), occupied_positions)
-                case other:
-                    raise Exception(f"Invalid jet pattern {other}")
-            can_move = rock.move(Point2D(0, -1), occupied_positions)
-            if not can_move:
-                occupied_positions.update(rock.position)
-                height = max(height, max(p.y for p in rock.position) + 1)
-                # Arbitrarily cut off everything but the top 100 rows
-                # We could do something smarter here... but this works.
-                occupied_positions = {
-                    p for p in occupied_positions if height - p.y < 100
-                }
-                rock_cycle = cycle_detector.check_cycle(
-                    occupied_positions,
-                    jet_offset,
-                    rock_offset,
-                    rock_number,
-                    height,
-                )
-                if rock_cycle is not None:
-                    rock_delta, height_delta = rock_cycle
-                    skips = (number - rock_number) // rock_delta
-                    rock_number += skips * rock_delta
-                    height += skips * height_delta
-                    occupied_positions = {
-                        p + Point2D(0, skips * height_delta) for p in occupied_positions
-                    }
-                rock_number += 1
-                if rock_number == number:
-                    return height
+            below = int.from_bytes(chamber[y - 1 : y - 1 + WINDOW], "little")
+            if below & rock.packed[x]:
                 break
+            y -= 1
+            next_x = x + jets[jet_offset]
+            jet_offset = (jet_offset + 1) % len(jets)
+            if 0 <= next_x <= rock.max_x and not below & rock.packed[next_x]:
+                x = next_x
+
+        for i, row in enumerate(rock.rows[x]):
+            chamber[y + i] |= row
+        height = max(height, y + rock.height - 1)
+        rock_number += 1
+        dropped += 1
+
+        if cycle_detector is not None:
+            rock_cycle = cycle_detector.check_cycle(
+                bytes(chamber[max(height + 1 - MAX_DEPTH, 0) : height + 1]),
+                jet_offset,
+                rock_offset,
+                rock_number,
+                height,
+            )
+            if rock_cycle is not None:
+                rock_delta, height_delta = rock_cycle
+                skips = (number - rock_number) // rock_delta
+                rock_number += skips * rock_delta
+                skipped_height += skips * height_delta
+                cycle_detector = None  # Only the last few rocks are left
+
+    count("day17.rocks", dropped)
+    return height + skipped_height
 
 
 def run(file: TextIO) -> Result:
     """Solution for Day 17."""
     line = next(file).strip()
 
-    part1 = drop_rocks(line, 2022)
-    part2 = drop_rocks(line, 1000000000000)
-
-    return Result(part1, part2)
+    return Result(
+        lambda: drop_rocks(line, 2022), lambda: drop_rocks(line, 1000000000000)
+    )
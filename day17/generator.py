@@ -0,0 +1,10 @@
+"""Input generator for Day 17."""
+from random import Random
+from typing import TextIO
+
+DEFAULT_SCALE = 10091
+
+
+def generate(file: TextIO, scale: int, rng: Random) -> None:
+    """Write a pattern of `scale` jets."""
+    file.write("".join(rng.choices("<>", k=scale)) + "\n")
@@ -0,0 +1,12 @@
+"""Tests for Day 17."""
+from day17.day17 import drop_rocks
+
+# The highest rock in each column repeats here before the rows under them do
+FALSE_CYCLE_PATTERN = "<><<>>>><>>>>><><><>><>><<<<<>><><<<<"
+
+
+def test_drop_rocks_ignores_false_cycles() -> None:
+    """Only a repeat of the whole top of the chamber counts as a cycle."""
+    assert drop_rocks(FALSE_CYCLE_PATTERN, 2022) == 2646
+    assert drop_rocks(FALSE_CYCLE_PATTERN, 2864) == 3752
+    assert drop_rocks(FALSE_CYCLE_PATTERN, 1000000000000) == 1308571428571
@@ -0,0 +1,21 @@
+"""Input generator for Day 18."""
+from random import Random
+from typing import TextIO
+
+DEFAULT_SCALE = 2800
+
+
+def generate(file: TextIO, scale: int, rng: Random) -> None:
+    """Write a roughly spherical droplet of about `scale` cubes, riddled with air."""
+    size = max(round((2 * scale) ** (1 / 3)), 2)
+    centre = (size - 1) / 2
+    radius_squared = (size / 2) ** 2
+    for x in range(size):
+        for y in range(size):
+            file.writelines(
+                f"{x + 1},{y + 1},{z + 1}\n"
+                for z in range(size)
+                if (x - centre) ** 2 + (y - centre) ** 2 + (z - centre) ** 2
+                <= radius_squared
+                and rng.random() < 0.9
+            )
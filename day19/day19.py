@@ -3,14 +3,14 @@ from __future__ import annotations
 
 import math
 import re
-from collections import Counter, defaultdict
-from dataclasses import dataclass
+from collections import Counter
 from enum import Enum
 from functools import partial
-from multiprocessing import Pool
 from typing import TextIO
 
 from result import Result
+from utils import parallel
+from utils.instrument import count
 from utils.parse import read_lines
 
 regex = re.compile(r"Each (?P<resource>\w*) robot costs (?P<costs>.*?)\.")
@@ -25,12 +25,9 @@ class Resource(Enum):
     GEODE = "geode"
 
 
-@dataclass
-class Turn:
-    """A turn in a blueprint evaluation."""
-
-    robots: Counter[Resource]
-    resources: Counter[Resource]
+# The resources that robots are paid for with, in the order they're packed in states
+MATERIALS = [Resource.ORE, Resource.CLAY, Resource.OBSIDIAN]
+ROBOTS = MATERIALS + [Resource.GEODE]
 
 
 class Blueprint:
@@ -44,31 +41,18 @@ class Blueprint:
             for resource in Resource
         }
 
-    def options(
-        self, resources: Counter[Resource], robots: Counter[Resource]
-    ) -> set[tuple[Resource, int]]:
-        """Gety the options that can be built and the time it takes to build them."""
-        result = set()
-        for output_robot, cost in self.robot_costs.items():
-            if not all(resource in robots for resource in cost):
-                continue  # We aren't producing a required material
-            if (
-                robots[output_robot] >= self.max_cost_per_resource[output_robot]
-                and output_robot != Resource.GEODE
-            ):
-                continue  # We already have the maximum number of this robot that we want
+    def packed_costs(self) -> list[tuple[int, tuple[int, int, int]]]:
+        """Get each robot with its cost in each material, most valuable first.
 
-            turns_needed = 1 + max(
-                max(
-                    # Int ceiling division -(a // -b)
-                    -((required_amount - resources[resource]) // -robots[resource])
-                    for resource, required_amount in cost.items()
-                ),
-                0,
-            )
-
-            result.add((output_robot, turns_needed))
-        return result
+        Robots are numbered by their material's position in `MATERIALS`, with geode
+        robots last.  Trying the most valuable first finds good answers early.
+        """
+        ore, clay, obsidian = MATERIALS
+        return [
+            (robot, (costs[ore], costs[clay], costs[obsidian]))
+            for robot, output in reversed(list(enumerate(ROBOTS)))
+            if (costs := self.robot_costs.get(output)) is not None
+        ]
 
     @staticmethod
     def from_string(line: str) -> Blueprint:
@@ -83,24 +67,46 @@ class Blueprint:
         return Blueprint(blueprint_costs)
 
 
-def theoretical_max(turn: Turn, time_left: int) -> int:
-    """Compute the theoretical maximum number of geodes possible."""
-    return (
-        turn.resources[Resource.GEODE]
-        + turn.robots[Resource.GEODE] * time_left
-        + time_left * (time_left + 1) // 2  # If we built one geode robot per turn
-    )
+def theoretical_max(
+    time_left: int,
+    clay_robots: int,
+    obsidian_robots: int,
+    clay: int,
+    obsidian: int,
+    obsidian_robot_clay: int,
+    geode_robot_obsidian: int,
+) -> int:
+    """Compute an upper bound on the number of extra geodes possible.
 
+    This plays out the rest of the time as if ore were free and a robot of every kind
+    could be built each turn: a clay robot every turn, and an obsidian or geode robot
+    whenever there's the clay or obsidian for one.  With nothing else to spend them on,
+    building as early as possible is best, so nothing can do better.
+    """
+    geodes = 0
+    for time_left in range(time_left - 1, 0, -1):
+        build_geode = obsidian >= geode_robot_obsidian
+        build_obsidian = clay >= obsidian_robot_clay
+        clay += clay_robots
+        obsidian += obsidian_robots
+        clay_robots += 1
+        if build_geode:
+            obsidian -= geode_robot_obsidian
+            geodes += time_left
+        if build_obsidian:
+            clay -= obsidian_robot_clay
+            obsidian_robots += 1
+    return geodes
 
-def prune(robots_and_resources: list[Turn], best: int, time_left: int) -> list[Turn]:
-    """Prune branches that aren't relevant."""
-    if not robots_and_resources or best == 0:
-        return robots_and_resources
-    return [
-        turn
-        for turn in robots_and_resources
-        if theoretical_max(turn, time_left) >= best
-    ]
+
+def _limit(stock: int, robots: int, max_cost: int, time_left: int) -> int:
+    """Cap a stock at the most that could still be needed, so more makes no difference.
+
+    At most `max_cost` can be spent a turn, so with this much there's always enough.
+    """
+    if robots < max_cost:
+        return min(stock, max_cost + (time_left - 1) * (max_cost - robots))
+    return min(stock, max_cost)
 
 
 def crack_geodes(
@@ -109,56 +115,146 @@ def crack_geodes(
     starting_resources: Counter[Resource],
     total_time: int,
 ) -> int:
-    """Figure out how many geodes can be cracked by a blueprint."""
-    turns = defaultdict(list, {0: [Turn(starting_robots, starting_resources)]})
+    """Figure out how many geodes can be cracked by a blueprint.
+
+    This is a depth-first search over which robot to build next, waiting until it can
+    be afforded.  States are tuples of the time left, the robots and stock of each
+    material, and the geodes that the geode robots built so far will have cracked by
+    the end, so geode robots don't need tracking.  Stock that could never be spent is
+    dropped so that more states are the same, each state is only searched once, and
+    branches are cut when even `theoretical_max` can't beat the best so far.
+    """
+    robot_costs = blueprint.packed_costs()
+    # There's no point having more robots of a material than can be spent in a turn
+    max_robots = [blueprint.max_cost_per_resource[material] for material in MATERIALS]
+    ore_cap, clay_cap, obsidian_cap = max_robots
+    obsidian_robot_clay = blueprint.robot_costs[Resource.OBSIDIAN][Resource.CLAY]
+    geode_robot_obsidian = blueprint.robot_costs[Resource.GEODE][Resource.OBSIDIAN]
+
+    start = (
+        total_time,
+        *(starting_robots[material] for material in MATERIALS),
+        *(starting_resources[material] for material in MATERIALS),
+        starting_resources[Resource.GEODE]
+        + starting_robots[Resource.GEODE] * total_time,
+    )
     max_geodes_at_end = 0
-    for turn_num in range(total_time):
-        time_left = total_time - turn_num
-        turns[turn_num] = prune(turns[turn_num], max_geodes_at_end, time_left)
-        for turn in turns[turn_num]:
-            options = blueprint.options(turn.resources, turn.robots)
-            for option, turns_required in options:
-                if turns_required > time_left:
-                    continue
-                new_robots = turn.robots + Counter({option: 1})
-                new_resources = (
-                    turn.resources
-                    + Counter({k: v * turns_required for k, v in turn.robots.items()})
-                    - blueprint.robot_costs[option]
-                )
-                turns[turn_num + turns_required].append(Turn(new_robots, new_resources))
-                max_geodes_at_end = max(
-                    max_geodes_at_end,
-                    turn.robots[Resource.GEODE] * time_left
-                    + turn.resources[Resource.GEODE],
-                )
+    seen = {start}
+    stack = [start]
+    while stack:
+        (
+            time_left,
+            ore_robots,
+            clay_robots,
+            obsidian_robots,
+            ore,
+            clay,
+            obsidian,
+            geodes,
+        ) = stack.pop()
+        if (
+            geodes
+            + theoretical_max(
+                time_left,
+                clay_robots,
+                obsidian_robots,
+                clay,
+                obsidian,
+                obsidian_robot_clay,
+                geode_robot_obsidian,
+            )
+            <= max_geodes_at_end
+        ):
+            continue
+        robots = (ore_robots, clay_robots, obsidian_robots)
+        can_build = False
+        for robot, (ore_cost, clay_cost, obsidian_cost) in robot_costs:
+            if robot < len(robots) and robots[robot] >= max_robots[robot]:
+                continue  # We already have the maximum number of this robot that we want
+            if (
+                (ore_cost and not ore_robots)
+                or (clay_cost and not clay_robots)
+                or (obsidian_cost and not obsidian_robots)
+            ):
+                continue  # We aren't producing a required material
+            # Int ceiling division -(a // -b)
+            turns_needed = 1 + max(
+                -((ore_cost - ore) // -ore_robots) if ore_cost > ore else 0,
+                -((clay_cost - clay) // -clay_robots) if clay_cost > clay else 0,
+                -((obsidian_cost - obsidian) // -obsidian_robots)
+                if obsidian_cost > obsidian
+                else 0,
+            )
+            if turns_needed > time_left:
+                continue
+            can_build = True
+            next_time_left = time_left - turns_needed
+            next_robots = list(robots)
+            next_geodes = geodes
+            if robot < len(robots):
+                next_robots[robot] += 1
+            else:
+                next_geodes += next_time_left
+            next_ore_robots, next_clay_robots, next_obsidian_robots = next_robots
+            state = (
+                next_time_left,
+                next_ore_robots,
+                next_clay_robots,
+                next_obsidian_robots,
+                _limit(
+                    ore + ore_robots * turns_needed - ore_cost,
+                    next_ore_robots,
+                    ore_cap,
+                    next_time_left,
+                ),
+                _limit(
+                    clay + clay_robots * turns_needed - clay_cost,
+                    next_clay_robots,
+                    clay_cap,
+                    next_time_left,
+                ),
+                _limit(
+                    obsidian + obsidian_robots * turns_needed - obsidian_cost,
+                    next_obsidian_robots,
+                    obsidian_cap,
+                    next_time_left,
+                ),
+                next_geodes,
+            )
+            if state not in seen:
+                seen.add(state)
+                stack.append(state)
+        if can_build:
+            # Like the search this replaced, only count states that can still build
+            # something, to give exactly the same answers
+            max_geodes_at_end = max(max_geodes_at_end, geodes)
 
+    count("day19.states", len(seen))
     return max_geodes_at_end
 
 
-def run(file: TextIO) -> Result:
-    """Solution for Day 19."""
-    pool = Pool()
-    blueprints = [Blueprint.from_string(line) for line in read_lines(file)]
+def max_geodes(blueprints: list[Blueprint], total_time: int) -> list[int]:
+    """Find the most geodes each blueprint can crack, in parallel."""
     robots = Counter({Resource.ORE: 1})
     resources: Counter[Resource] = Counter()
-    p1 = pool.map(
+    # Blueprints vary a lot in how long they take, so they're sent out one at a time
+    return parallel.map(
         partial(
             crack_geodes,
             starting_robots=robots,
             starting_resources=resources,
-            total_time=24,
+            total_time=total_time,
         ),
         blueprints,
+        chunksize=1,
     )
-    p2 = pool.map(
-        partial(
-            crack_geodes,
-            starting_robots=robots,
-            starting_resources=resources,
-            total_time=32,
-        ),
-        blueprints[:3],
-    )
 
-    return Result(sum(i * p for i, p in enumerate(p1, start=1)), math.prod(p2))
+
+def run(file: TextIO) -> Result:
+    """Solution for Day 19."""
+    blueprints = [Blueprint.from_string(line) for line in read_lines(file)]
+
+    return Result(
+        lambda: sum(i * p for i, p in enumerate(max_geodes(blueprints, 24), start=1)),
+        lambda: math.prod(max_geodes(blueprints[:3], 32)),
+    )
@@ -0,0 +1,19 @@
+"""Input generator for Day 19."""
+from random import Random
+from typing import TextIO
+
+DEFAULT_SCALE = 30
+
+
+def generate(file: TextIO, scale: int, rng: Random) -> None:
+    """Write `scale` blueprints with costs in the same ranges as the real ones."""
+    for blueprint_id in range(1, scale + 1):
+        file.write(
+            f"Blueprint {blueprint_id}: "
+            f"Each ore robot costs {rng.randint(2, 4)} ore. "
+            f"Each clay robot costs {rng.randint(2, 4)} ore. "
+            f"Each obsidian robot costs {rng.randint(2, 4)} ore "
+            f"and {rng.randint(5, 20)} clay. "
+            f"Each geode robot costs {rng.randint(2, 4)} ore "
+            f"and {rng.randint(5, 20)} obsidian.\n"
+        )
@@ -1,105 +1,105 @@
 """Day 20."""
 
-from __future__ import annotations
-
-from dataclasses import dataclass
-from itertools import pairwise
-from typing import Optional, TextIO
+import sys
+from array import array
+from bisect import bisect_right
+from itertools import accumulate
+from math import isqrt
+from typing import TextIO
 
 from result import Result
+from utils.instrument import count
 from utils.parse import read_lines
 
-
-@dataclass
-class Node:
-    """Triply-linked list."""
-
-    value: int
-    next: Node
-    previous: Node
-    original_next: Optional[Node]
-
-    def get_offset(self, offset: int) -> Node:
-        """Get an node at a certain offset."""
-        node = self
-        for _ in range(abs(offset)):
-            if offset > 0:
-                node = node.next
-            else:
-                node = node.previous
-        return node
-
-    def set_next(self, other: Node) -> None:
-        """Set the next node."""
-        other.previous = self
-        self.next = other
-
-    def move(self, offset: int) -> None:
-        """Move this node by a certain offset."""
-        if offset == 0:
-            return
-        self.previous.set_next(self.next)
-
-        comes_after = self.get_offset(offset if offset > 0 else offset - 1)
-        self.set_next(comes_after.next)
-        comes_after.set_next(self)
-
-    def mix(self, length: int) -> None:
-        """Mix the list."""
-        node: Optional[Node] = self
-        while node is not None:
-            mod_offset = (
-                (node.value % length) if node.value > 0 else (node.value % -length)
-            )
-            node.move(mod_offset)
-            node = node.original_next
-
-    def find(self, value: int) -> Node:
-        """Find a particular node by value."""
-        node = self
-        while True:
-            if node.value == value:
-                return node
-            node = node.next
-            if node == self:
-                raise Exception("Could not find value")
-
-    @staticmethod
-    def from_list(data: list[int]) -> Node:
-        """Build from list."""
-        # just gonna cheat on the typing here cuz it makes the typing way nicer elsewhere.
-        nodes = [Node(val, None, None, None) for val in data]  # type: ignore
-        for node, next_node in pairwise(nodes):
-            node.next = next_node
-            node.original_next = next_node
-            next_node.previous = node
-        nodes[0].previous = nodes[-1]
-        nodes[-1].next = nodes[0]
-        return nodes[0]
-
-    def compute_grove_coords(self) -> int:
-        """Compute the Grove coordinates."""
-        node = self.find(0)
-        result = 0
-        for _ in range(3):
-            node = node.get_offset(1000)
-            result += node.value
-
-        return result
+# Numbers are identified by their original index, packed into a C int
+KEY_SIZE = array("i").itemsize
 
 
 def mix(data: list[int], rounds: int = 1) -> list[int]:
-    """Mix a list of numbers."""
-    mixed = list(enumerate(data))
+    """Mix a list of numbers, moving each by its value in their original order.
+
+    The list is split into blocks of about sqrt(n) numbers, each a bytearray of the
+    numbers' packed original indices.  Finding a number in its block is then a substring
+    search and moving it is a small memmove, both in C.  The blocks are gathered into
+    groups of about sqrt(blocks) so that the position of a block, and the block at a
+    position, only take a couple of short sums over the block and group sizes.  Each
+    round starts from freshly split blocks, so they never get far out of balance.
+    """
+    length = len(data)
+    if length < 2:
+        return list(data)
+    # All positions and sizes are in bytes, so they're multiples of KEY_SIZE
+    modulus = (length - 1) * KEY_SIZE
+    shifts = [value * KEY_SIZE % modulus for value in data]
+    # The keys are packed the same way as the array, in native byte order
+    keys = [i.to_bytes(KEY_SIZE, sys.byteorder) for i in range(length)]
+    block_size = isqrt(length) * KEY_SIZE
+    order = array("i", range(length)).tobytes()
+
     for _ in range(rounds):
-        for step in range(len(mixed)):
-            item_index = next(
-                i for i, (step_num, _) in enumerate(mixed) if step_num == step
+        blocks = [
+            bytearray(order[start : start + block_size])
+            for start in range(0, len(order), block_size)
+        ]
+        group_size = isqrt(len(blocks))
+        block_of = [0] * length
+        for b, block in enumerate(blocks):
+            for i in array("i", block):
+                block_of[i] = b
+        sizes = [len(block) for block in blocks]
+        group_sizes = [
+            sum(sizes[start : start + group_size])
+            for start in range(0, len(sizes), group_size)
+        ]
+        moved_blocks = 0
+
+        for i, (key, shift) in enumerate(zip(keys, shifts)):
+            b = block_of[i]
+            block = blocks[b]
+            offset = block.find(key)
+            while offset % KEY_SIZE:
+                # Matched across the boundary between two keys
+                offset = block.find(key, offset + 1)
+
+            group = b // group_size
+            group_ends = list(accumulate(group_sizes))
+            position = (
+                group_ends[group]
+                - group_sizes[group]
+                + sum(sizes[group * group_size : b])
+                + offset
             )
-            (step_num, val) = mixed.pop(item_index)
-            new_position = (item_index + val) % len(mixed)
-            mixed.insert(new_position, (step_num, val))
-    return [val for _, val in mixed]
+            # Where to insert, as a position in the list before the number is removed
+            target = (position + shift) % modulus
+            if target >= position:
+                target += KEY_SIZE
+
+            target_group = bisect_right(group_ends, target)
+            target -= group_ends[target_group] - group_sizes[target_group]
+            first = target_group * group_size
+            ends = list(accumulate(sizes[first : first + group_size]))
+            t = bisect_right(ends, target)
+            target_offset = target - ends[t] + sizes[first + t]
+            t += first
+
+            if t == b:
+                del block[offset : offset + KEY_SIZE]
+                if target_offset > offset:
+                    target_offset -= KEY_SIZE
+                block[target_offset:target_offset] = key
+            else:
+                blocks[t][target_offset:target_offset] = key
+                del block[offset : offset + KEY_SIZE]
+                sizes[b] -= KEY_SIZE
+                sizes[t] += KEY_SIZE
+                group_sizes[group] -= KEY_SIZE
+                group_sizes[target_group] += KEY_SIZE
+                block_of[i] = t
+                moved_blocks += 1
+
+        count("day20.block_moves", moved_blocks)
+        order = b"".join(blocks)
+    return [data[i] for i in array("i", order)]
 
 
 def compute_grove_coords(data: list[int]) -> int:
@@ -108,23 +108,13 @@ def compute_grove_coords(data: list[int]) -> int:
     return sum(data[(i + zero_index) % len(data)] for i in range(1000, 3001, 1000))
 
 
+def decrypt(data: list[int], key: int, rounds: int) -> int:
+    """Decrypt the grove coordinates, mixing the data the given number of times."""
+    return compute_grove_coords(mix([val * key for val in data], rounds))
+
+
 def run(file: TextIO) -> Result:
     """Solution for Day 20."""
     data = [int(x) for x in read_lines(file)]
 
-    # I did it twice...
-    # Turns out the triply-linked list is only marginally faster than brute force :(
-    p1 = Node.from_list(data)
-    p1.mix(len(data) - 1)
-    p2 = Node.from_list([x * 811589153 for x in data])
-    for _ in range(10):
-        p2.mix(len(data) - 1)
-
-    mixed = mix(data)
-    p2_data = [val * 811589153 for val in data]
-    p2_mixed = mix(p2_data, 10)
-
-    assert compute_grove_coords(mixed) == p1.compute_grove_coords()
-    assert compute_grove_coords(p2_mixed) == p2.compute_grove_coords()
-
-    return Result(p1.compute_grove_coords(), p2.compute_grove_coords())
+    return Result(lambda: decrypt(data, 1, 1), lambda: decrypt(data, 811589153, 10))
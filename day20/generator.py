@@ -0,0 +1,15 @@
+"""Input generator for Day 20."""
+from random import Random
+from typing import TextIO
+
+DEFAULT_SCALE = 5000
+
+
+def generate(file: TextIO, scale: int, rng: Random) -> None:
+    """Write `scale` numbers to mix, exactly one of them zero."""
+    zero_index = rng.randrange(scale)
+    for i in range(scale):
+        value = 0
+        while value == 0 and i != zero_index:
+            value = rng.randint(-10000, 10000)
+        file.write(f"{value}\n")
@@ -0,0 +1,80 @@
+"""Input generator for Day 21."""
+import string
+from random import Random
+from typing import TextIO
+
+DEFAULT_SCALE = 2001
+ROOT = "root"
+HUMAN = "humn"
+
+
+class MonkeyTree:
+    """Builds a tree of monkeys whose arithmetic always comes out exact."""
+
+    def __init__(self, rng: Random, size: int) -> None:
+        """Start an empty tree, with names long enough to give every monkey its own."""
+        self.rng = rng
+        self.name_length = 4
+        while len(string.ascii_lowercase) ** self.name_length < 4 * size:
+            self.name_length += 1
+        self.names = {ROOT, HUMAN}
+        self.lines: list[str] = []
+
+    def new_name(self) -> str:
+        """Pick an unused name."""
+        while True:
+            name = "".join(self.rng.choices(string.ascii_lowercase, k=self.name_length))
+            if name not in self.names:
+                self.names.add(name)
+                return name
+
+    def build(self, size: int, value: int, human: bool, name: str = "") -> str:
+        """Add a subtree of `size` monkeys that yells `value`, returning its root."""
+        name = name or (HUMAN if human and size == 1 else self.new_name())
+        if size == 1:
+            self.lines.append(f"{name}: {value}")
+            return name
+
+        op, left_value, right_value = self.split(value)
+        left_size = self.rng.randrange(1, size - 1, 2)
+        human_left = human and self.rng.random() < 0.5
+        left = self.build(left_size, left_value, human_left)
+        right = self.build(size - 1 - left_size, right_value, human and not human_left)
+        self.lines.append(f"{name}: {left} {op} {right}")
+        return name
+
+    def split(self, value: int) -> tuple[str, int, int]:
+        """Pick an operation and two positive operands that give exactly `value`."""
+        choice = self.rng.random()
+        if choice < 0.4 and value >= 2:
+            left = self.rng.randint(1, value - 1)
+            return "+", left, value - left
+        if choice < 0.6:
+            divisors = [d for d in range(2, 21) if value % d == 0 and d < value]
+            if divisors:
+                divisor = self.rng.choice(divisors)
+                left, right = self.rng.sample([value // divisor, divisor], 2)
+                return "*", left, right
+        if choice < 0.8 and value < 10**9:
+            divisor = self.rng.randint(2, 10)
+            return "/", value * divisor, divisor
+        subtracted = self.rng.randint(1, 100)
+        return "-", value + subtracted, subtracted
+
+
+def generate(file: TextIO, scale: int, rng: Random) -> None:
+    """Write about `scale` monkeys, with the human somewhere under the root.
+
+    Both sides of the root yell the same number, so the human's current number is the
+    answer to part 2.
+    """
+    size = max(scale, 3) | 1
+    tree = MonkeyTree(rng, size)
+    value = rng.randint(1000, 100000)
+    left_size = rng.randrange(1, size - 1, 2)
+    human_left = rng.random() < 0.5
+    left = tree.build(left_size, value, human_left)
+    right = tree.build(size - 1 - left_size, value, not human_left)
+    tree.lines.append(f"{ROOT}: {left} + {right}")
+    rng.shuffle(tree.lines)
+    file.writelines(line + "\n" for line in tree.lines)
@@ -5,6 +5,7 @@ from typing import Iterable, TextIO
 
 from result import Result
 from utils.geometry import Point2D
+from utils.grid import Grid
 from utils.iterables import read_iter_until
 from utils.parse import read_lines
 
@@ -18,6 +19,8 @@ class Facing(Enum):
     UP = 3
 
 
+VOID, OPEN, WALL = b" .#"
+
 EdgesType = dict[tuple[int, Facing], tuple[Point2D, Facing]]
 
 MOVEMENT = {
@@ -34,7 +37,7 @@ class Position:
     def __init__(
         self,
         start: Point2D,
-        grid: dict[Point2D, bool],
+        grid: Grid,
         edges: EdgesType,
         facing: Facing = Facing.RIGHT,
     ) -> None:
@@ -49,13 +52,12 @@ class Position:
         for _ in range(distance):
             new_position = self.position + MOVEMENT[self.facing]
             new_facing = self.facing
-            if new_position not in self.grid:
+            if self.grid[new_position] == VOID:
                 if self.facing in {Facing.LEFT, Facing.RIGHT}:
                     new_position, new_facing = self.edges[(new_position.y, self.facing)]
                 else:
                     new_position, new_facing = self.edges[(new_position.x, self.facing)]
-            new_cell = self.grid[new_position]
-            if not new_cell:
+            if self.grid[new_position] == WALL:
                 break
             self.position = new_position
             self.facing = new_facing
@@ -88,10 +90,12 @@ def parse_actions(data: str) -> Iterable[int | str]:
             yield char
 
 
-def compute_part1_edges(grid: dict[Point2D, bool]) -> EdgesType:
+def compute_part1_edges(grid: Grid) -> EdgesType:
     """Compute the transition edges for part 1."""
     edges: dict[tuple[int, Facing], Point2D] = {}
-    for p in grid:
+    for p, cell in grid.items():
+        if cell == VOID:
+            continue
         if p.x <= edges.get((p.y, Facing.RIGHT), p).x:
             edges[(p.y, Facing.RIGHT)] = p
         if p.x >= edges.get((p.y, Facing.LEFT), p).x:
@@ -140,21 +144,13 @@ def compute_part2_edges() -> EdgesType:
 def run(file: TextIO) -> Result:
     """Solution for Day 22."""
     lines = read_lines(file)
+    board, _ = read_iter_until(lines, {""})
 
-    grid = {}
-
-    for y, line in enumerate(lines, start=1):
-        if not line:
-            break
-        for x, cell in enumerate(line, start=1):
-            p = Point2D(x, y)
-            match cell:
-                case ".":
-                    grid[p] = True
-                case "#":
-                    grid[p] = False
-                case _:
-                    continue
+    # Positions start from 1, so leave a void border all the way round
+    grid = Grid(max(len(line) for line in board) + 2, len(board) + 2, fill=VOID)
+    for y, line in enumerate(board, start=1):
+        row_start = grid.index(1, y)
+        grid.data[row_start : row_start + len(line)] = line.encode()
 
     p1_edges = compute_part1_edges(grid)
     p2_edges = compute_part2_edges()
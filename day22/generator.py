@@ -0,0 +1,30 @@
+"""Input generator for Day 22."""
+from random import Random
+from typing import TextIO
+
+DEFAULT_SCALE = 2000
+FACE_SIZE = 50
+# Which faces of the net are present, one row of faces at a time
+NET = ["_##", "_#_", "##_", "#__"]
+
+
+def generate(file: TextIO, scale: int, rng: Random) -> None:
+    """Write a board folded like the real input's cube, and a path of `scale` moves.
+
+    The solution hard-codes how the real input's net folds up, so the net is always the
+    same shape and only the walls and the path change.
+    """
+    for face_row, faces in enumerate(NET):
+        width = (faces.rindex("#") + 1) * FACE_SIZE
+        for y in range(face_row * FACE_SIZE, (face_row + 1) * FACE_SIZE):
+            row = [
+                " " if faces[x // FACE_SIZE] == "_" else rng.choices(".#", [9, 1])[0]
+                for x in range(width)
+            ]
+            if y == 0:
+                row[FACE_SIZE] = "."  # The starting tile
+            file.write("".join(row) + "\n")
+
+    moves = [str(rng.randint(1, FACE_SIZE)) for _ in range(max(scale, 1))]
+    turns = rng.choices("LR", k=len(moves) - 1)
+    file.write("\n" + "".join(m + t for m, t in zip(moves, turns)) + moves[-1] + "\n")
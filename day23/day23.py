@@ -1,12 +1,13 @@
 """Day 23."""
 
 from collections import Counter, deque
-from itertools import count
-from typing import Iterable, TextIO
+from functools import cache
+from itertools import islice
+from typing import Iterable, Iterator, Optional, TextIO
 
 from result import Result
 from utils.geometry import ALL_DIRECTIONS, Point2D
-from utils.parse import read_lines
+from utils.parse import read_byte_grid
 
 MOVEMENTS = (
     ((Point2D(-1, -1), Point2D(0, -1), Point2D(1, -1)), Point2D(0, -1)),
@@ -60,6 +61,8 @@ def move(
 
 def compute_empty_tiles(elves: set[Point2D]) -> int:
     """Compute the number of empty tiles in the bounding box of the elves."""
+    if not elves:
+        return 0
     min_y = min([e.y for e in elves])
     min_x = min([e.x for e in elves])
     max_y = max([e.y for e in elves])
@@ -68,23 +71,57 @@ def compute_empty_tiles(elves: set[Point2D]) -> int:
     return (max_x - min_x + 1) * (max_y - min_y + 1) - len(elves)
 
 
-def run(file: TextIO) -> Result:
-    """Solution for Day 23."""
-    elves = set()
-    for y, line in enumerate(read_lines(file)):
-        for x, cell in enumerate(line):
-            if cell == "#":
-                elves.add(Point2D(x, y))
-
+def spread_out(elves: set[Point2D]) -> Iterator[set[Point2D]]:
+    """Move the elves round by round, yielding their positions until none of them move."""
     possibly_moving_elves = set(elves)
     movements = deque(MOVEMENTS)
-    for i in count(1):
+    while True:
         new_elves, possibly_moving_elves = move(movements, elves, possibly_moving_elves)
         if elves == new_elves:
-            break
+            return
         elves = new_elves
         movements.rotate(-1)
-        if i == 10:
-            part1 = compute_empty_tiles(elves)
+        yield elves
+
+
+class Simulation:
+    """Elves spreading out, run only as many rounds as have been asked for so far."""
+
+    def __init__(self, elves: set[Point2D]) -> None:
+        """Start the simulation from the elves' initial positions."""
+        self.elves = elves
+        self.rounds = 0
+        self._moves = spread_out(elves)
+
+    def run(self, rounds: Optional[int] = None) -> set[Point2D]:
+        """Run until some number of rounds in total, or the elves settle, if sooner.
+
+        Without a number of rounds, it runs until the elves settle.  Returns the elves'
+        positions at the end.
+        """
+        remaining = None if rounds is None else max(rounds - self.rounds, 0)
+        for self.elves in islice(self._moves, remaining):
+            self.rounds += 1
+        return self.elves
+
+
+def run(file: TextIO) -> Result:
+    """Solution for Day 23."""
+    elves = set()
+    for y, line in enumerate(read_byte_grid(file).rows()):
+        for x, cell in enumerate(line):
+            if cell == ord("#"):
+                elves.add(Point2D(x, y))
+    simulation = Simulation(elves)
+
+    @cache
+    def part1() -> int:
+        return compute_empty_tiles(simulation.run(10))
+
+    def part2() -> int:
+        # The simulation only goes forwards, so part 1 has to see round 10 first
+        part1()
+        simulation.run()
+        return simulation.rounds + 1  # The first round where nobody moves
 
-    return Result(part1, i)
+    return Result(part1, part2)
@@ -0,0 +1,11 @@
+"""Input generator for Day 23."""
+from random import Random
+from typing import TextIO
+
+DEFAULT_SCALE = 72
+
+
+def generate(file: TextIO, scale: int, rng: Random) -> None:
+    """Write a `scale` by `scale` grove with elves on about 40% of the tiles."""
+    for _ in range(scale):
+        file.write("".join(rng.choices(".#", [3, 2], k=scale)) + "\n")
@@ -1,13 +1,22 @@
 """Day 24."""
-from collections import deque
 from dataclasses import dataclass
+from functools import cache
 from typing import TextIO
 
 from result import Result
 from utils.geometry import DIRECTIONS, Point2D
-from utils.parse import read_lines
+from utils.grid import Grid
+from utils.instrument import count, timer
+from utils.parse import read_byte_grid
+from utils.search import SearchStats, bfs
 
 MOVE_OPTIONS = DIRECTIONS + [Point2D(0, 0)]
+BLIZZARD_DIRECTIONS = {
+    ord(">"): Point2D(1, 0),
+    ord("<"): Point2D(-1, 0),
+    ord("^"): Point2D(0, -1),
+    ord("v"): Point2D(0, 1),
+}
 
 
 @dataclass
@@ -27,12 +36,15 @@ class Blizzard:
 
 def compute_occupied_spaces(
     blizzards: list[Blizzard], max_x: int, max_y: int, turn_count: int
-) -> dict[int, set[Point2D]]:
+) -> list[Grid]:
     """Compute the spaces that are occupied by a set of blizzards for a each turn."""
-    return {
-        turn: {b.at_turn(turn, max_x, max_y) for b in blizzards}
-        for turn in range(turn_count)
-    }
+    occupied = []
+    for turn in range(turn_count):
+        grid = Grid(max_x, max_y)
+        for b in blizzards:
+            grid[b.at_turn(turn, max_x, max_y)] = 1
+        occupied.append(grid)
+    return occupied
 
 
 class Navigator:
@@ -40,8 +52,8 @@ class Navigator:
 
     def __init__(
         self,
-        horizontal_blizzards: dict[int, set[Point2D]],
-        vertical_blizzards: dict[int, set[Point2D]],
+        horizontal_blizzards: list[Grid],
+        vertical_blizzards: list[Grid],
         max_x: int,
         max_y: int,
     ) -> None:
@@ -53,57 +65,59 @@ class Navigator:
 
     def position_is_valid(self, position: Point2D, turn_num: int) -> bool:
         """Determine if a position is valid on a particular turn."""
-        return (
-            0 < position.x < self.max_x - 1
-            and 0 < position.y < self.max_y - 1
-            and position not in self.horizontal_blizzards[turn_num % (self.max_x - 2)]
-            and position not in self.vertical_blizzards[turn_num % (self.max_y - 2)]
+        if not (0 < position.x < self.max_x - 1 and 0 < position.y < self.max_y - 1):
+            return False
+        index = position.y * self.max_x + position.x  # The grids have no padding
+        return not (
+            self.horizontal_blizzards[turn_num % (self.max_x - 2)].data[index]
+            or self.vertical_blizzards[turn_num % (self.max_y - 2)].data[index]
         )
 
     def navigate(
         self, start_position: Point2D, end_position: Point2D, start_turn: int
     ) -> int:
         """Find a path from start to end."""
-        queue = deque([(start_position, start_turn)])
-        visited = set()
-        while True:
-            current_position, turn_num = queue.popleft()
-            memo_key = (
-                current_position,
-                turn_num % (self.max_x - 2),
-                turn_num % (self.max_y - 2),
+
+        def moves(state: tuple[Point2D, int]) -> list[tuple[Point2D, int]]:
+            current_position, turn_num = state
+            return [
+                (new_position, turn_num + 1)
+                for option in MOVE_OPTIONS
+                if (new_position := current_position + option) == end_position
+                or new_position == start_position
+                or self.position_is_valid(new_position, turn_num + 1)
+            ]
+
+        def memo_key(state: tuple[Point2D, int]) -> tuple[Point2D, int, int]:
+            position, turn_num = state
+            return position, turn_num % (self.max_x - 2), turn_num % (self.max_y - 2)
+
+        stats = SearchStats()
+        with timer("day24.navigate"):
+            found = bfs(
+                [(start_position, start_turn)],
+                moves,
+                is_goal=lambda state: state[0] == end_position,
+                key=memo_key,
+                stats=stats,
             )
-            if memo_key in visited:
-                continue
-            visited.add(memo_key)
-            for option in MOVE_OPTIONS:
-                new_position = current_position + option
-                if new_position == end_position:
-                    return turn_num + 1
-                if (
-                    self.position_is_valid(new_position, turn_num + 1)
-                    or new_position == start_position
-                ):
-                    queue.append((new_position, turn_num + 1))
+        count("day24.bfs_expanded", stats.expanded)
+        assert found is not None
+        (_, end_turn), _ = found
+        return end_turn
 
 
 def run(file: TextIO) -> Result:
     """Solution for Day 24."""
+    grid = read_byte_grid(file)
     blizzards = []
-    for y, line in enumerate(read_lines(file)):
-        max_x = len(line)
+    for y, line in enumerate(grid.rows()):
         for x, cell in enumerate(line):
-            p = Point2D(x, y)
-            match cell:
-                case ">":
-                    blizzards.append(Blizzard(p, Point2D(1, 0)))
-                case "<":
-                    blizzards.append(Blizzard(p, Point2D(-1, 0)))
-                case "^":
-                    blizzards.append(Blizzard(p, Point2D(0, -1)))
-                case "v":
-                    blizzards.append(Blizzard(p, Point2D(0, 1)))
-    max_y = y + 1
+            direction = BLIZZARD_DIRECTIONS.get(cell)
+            if direction is not None:
+                blizzards.append(Blizzard(Point2D(x, y), direction))
+    max_x = grid.width
+    max_y = grid.height
     horizontal_blizzard_spaces = compute_occupied_spaces(
         [b for b in blizzards if b.direction.y == 0], max_x, max_y, max_x - 2
     )
@@ -118,8 +132,12 @@ def run(file: TextIO) -> Result:
         horizontal_blizzard_spaces, vertical_blizzard_spaces, max_x, max_y
     )
 
-    part1 = navigator.navigate(start_position, end_position, 0)
-    return_home = navigator.navigate(end_position, start_position, part1)
-    part2 = navigator.navigate(start_position, end_position, return_home)
+    @cache
+    def part1() -> int:
+        return navigator.navigate(start_position, end_position, 0)
+
+    def part2() -> int:
+        return_home = navigator.navigate(end_position, start_position, part1())
+        return navigator.navigate(start_position, end_position, return_home)
 
     return Result(part1, part2)
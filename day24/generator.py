@@ -0,0 +1,24 @@
+"""Input generator for Day 24."""
+from random import Random
+from typing import TextIO
+
+DEFAULT_SCALE = 122
+MIN_SCALE = 5
+
+
+def generate(file: TextIO, scale: int, rng: Random) -> None:
+    """Write a valley `scale` wide, with the same proportions as the real one.
+
+    Columns beneath the entrance and above the exit don't get vertical blizzards, since
+    those would blow straight out of the valley.
+    """
+    width = max(scale, MIN_SCALE)
+    height = max(width * 27 // 122, MIN_SCALE)
+    file.write("#." + "#" * (width - 2) + "\n")
+    for _ in range(height - 2):
+        row = ["#"]
+        for x in range(1, width - 1):
+            directions = "<>" if x in (1, width - 2) else "<>^v"
+            row.append(rng.choice(directions) if rng.random() < 0.35 else ".")
+        file.write("".join(row) + "#\n")
+    file.write("#" * (width - 2) + ".#\n")
@@ -6,20 +6,14 @@ from typing import TextIO
 from result import Result
 from utils.parse import read_lines
 
+# Each SNAFU digit as an ordinary base 5 digit, two more than its value
+SNAFU_DIGITS = str.maketrans("=-012", "01234")
+
 
 def snafu_to_decimal(val: str) -> int:
     """Convert a SNAFU to decimal."""
-    result = 0
-    for power, digit in enumerate(reversed(val)):
-        match digit:
-            case "-":
-                numeric = -1
-            case "=":
-                numeric = -2
-            case _:
-                numeric = int(digit)
-        result += numeric * (5**power)
-    return result
+    # Shifting every digit up by 2 makes a base 5 number, too big by 22...2 in base 5
+    return int(val.translate(SNAFU_DIGITS), 5) - int("2" * len(val), 5)
 
 
 def decimal_to_snafu(val: int) -> str:
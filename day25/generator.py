@@ -0,0 +1,12 @@
+"""Input generator for Day 25."""
+from random import Random
+from typing import TextIO
+
+DEFAULT_SCALE = 120
+
+
+def generate(file: TextIO, scale: int, rng: Random) -> None:
+    """Write `scale` positive SNAFU numbers of up to 20 digits."""
+    for _ in range(scale):
+        digits = rng.choice("12") + "".join(rng.choices("=-012", k=rng.randint(0, 19)))
+        file.write(digits + "\n")
@@ -1,47 +1,403 @@
-"""The driver program that is the main entrypoint for the application."""
-import importlib
+"""The driver program that is the main entrypoint for the application.
+
+Startup time matters here since `run` is called in scripted sweeps, so anything heavier
+than click is imported inside the command that needs it.  `startup` checks the budget.
+"""
+import time
+from contextlib import nullcontext
 from datetime import datetime
+from functools import partial
 from pathlib import Path
+from typing import TYPE_CHECKING, ContextManager, Optional, TextIO
 
 import click
-from cookiecutter.main import cookiecutter
 
-from driver_helpers.aoc_site import download_problem_input
+from driver_helpers.registry import get_solution
+from driver_helpers.runner import day_folder, parse_days, solve_parts
+from result import PARTS
+
+if TYPE_CHECKING:
+    from driver_helpers.memory import MemoryReport
+    from utils.instrument import Stats
 
 YEAR = 2022
 CURR_DAY = datetime.now().day
+STARTUP_BUDGET = 0.1
+
+
+def ensure_input(day: int, input_file_name: str) -> Path:
+    """Get the path to a day's input, downloading the real input if it's missing."""
+    input_file = day_folder(day) / input_file_name
+    if input_file_name == "input" and not input_file.is_file():
+        from driver_helpers.input_cache import install_input
+
+        install_input(YEAR, day, input_file)
+    return input_file
 
 
 @click.group()
-def cli() -> None:
+@click.option(
+    "-w",
+    "--workers",
+    type=click.IntRange(min=1),
+    envvar="AOC_WORKERS",
+    help="Worker processes for solutions that run in parallel [default: CPU count].",
+)
+def cli(workers: Optional[int]) -> None:
     """Run the cli."""
+    if workers is not None:
+        from utils.parallel import set_workers
+
+        set_workers(workers)
 
 
 @cli.command()
 @click.argument("day", default=CURR_DAY)
 def bootstrap(day: int) -> None:
     """Initialize a new folder for a day using the template and download the input."""
+    from cookiecutter.main import cookiecutter
+
+    from driver_helpers.input_cache import install_input
+
     day_str = str(day).zfill(2)
     cookiecutter("./template", extra_context={"day": day_str}, no_input=True)
-    with (Path(f"day{day_str}") / "input").open("wb") as fout:
-        download_problem_input(fout, YEAR, day)
+    install_input(YEAR, day, Path(f"day{day_str}") / "input")
+
+
+@cli.command()
+@click.argument("days", default=str(CURR_DAY))
+@click.option("--all", "all_days", is_flag=True, help="Fetch every day.")
+@click.option(
+    "-j",
+    "--jobs",
+    default=8,
+    show_default=True,
+    type=click.IntRange(min=1),
+    help="Parallel downloads.",
+)
+def fetch(days: str, all_days: bool, jobs: int) -> None:
+    """Fetch any missing inputs for some days (e.g. `1-25` or `1,3,5-7`)."""
+    from concurrent.futures import ThreadPoolExecutor
+
+    from driver_helpers.input_cache import install_input
+
+    missing = [
+        day
+        for day in parse_days("1-25" if all_days else days)
+        if not (day_folder(day) / "input").is_file()
+    ]
+    with ThreadPoolExecutor(jobs) as executor:
+        futures = {
+            day: executor.submit(install_input, YEAR, day, day_folder(day) / "input")
+            for day in missing
+        }
+    failed = []
+    for day, future in futures.items():
+        error = future.exception()
+        print(f"Day {day:02}: " + ("fetched" if error is None else f"failed ({error})"))
+        if error is not None:
+            failed.append(day)
+    if failed:
+        raise click.ClickException(
+            f"Failed to fetch days: {', '.join(str(day) for day in failed)}"
+        )
 
 
 @cli.command()
 @click.argument("day", default=CURR_DAY)
 @click.option("-i", "--input-file", "input_file_name", default="input")
-def run(day: int, input_file_name: str) -> None:
+@click.option("--profile", is_flag=True, help="Profile the solution with cProfile.")
+@click.option(
+    "--profile-limit",
+    default=20,
+    show_default=True,
+    help="Number of functions to show when profiling.",
+)
+@click.option(
+    "--profile-output",
+    type=click.Path(path_type=Path),
+    help="Write the profile to a .pstats file (implies --profile).",
+)
+@click.option(
+    "--cache/--no-cache",
+    default=False,
+    envvar="AOC_RESULT_CACHE",
+    help="Reuse the result from a previous run with the same input and code.",
+)
+@click.option("-p", "--part", type=click.IntRange(1, 2), help="Only compute one part.")
+@click.option("--stats", is_flag=True, help="Print the counters and timers recorded.")
+@click.option("--memory", is_flag=True, help="Report peak memory and allocation sites.")
+@click.option(
+    "--memory-limit",
+    default=10,
+    show_default=True,
+    help="Number of allocation sites to show when reporting memory.",
+)
+def run(
+    day: int,
+    input_file_name: str,
+    profile: bool,
+    profile_limit: int,
+    profile_output: Optional[Path],
+    cache: bool,
+    part: Optional[int],
+    stats: bool,
+    memory: bool,
+    memory_limit: int,
+) -> None:
     """Run the problem on the provided day."""
-    day_str = str(day).zfill(2)
-    input_file = Path(f"day{day_str}") / input_file_name
-    if input_file_name == "input" and not input_file.is_file():
-        with input_file.open("wb") as fout:
-            download_problem_input(fout, YEAR, day)
+    input_file = ensure_input(day, input_file_name)
+    profile = profile or profile_output is not None
+    parts = PARTS if part is None else (part,)
+    # Cached results skip the work that profiling, stats and memory are there to measure
+    cache = cache and not profile and not stats and not memory
+
+    if cache:
+        from driver_helpers import result_cache
+
+        cache_key = result_cache.cache_key(day, input_file)
+        cached = result_cache.lookup(cache_key)
+        if cached is not None:
+            print(cached.report(parts))
+            return
+
+    collecting: ContextManager[Optional[Stats]]
+    if stats:
+        from driver_helpers.instrument import collect_stats, format_stats
+
+        collecting = collect_stats()
+    else:
+        collecting = nullcontext()
+    tracking: ContextManager[Optional[MemoryReport]]
+    if memory:
+        from driver_helpers.memory import track_memory
+
+        tracking = track_memory(memory_limit)
+    else:
+        tracking = nullcontext()
+
+    solve = partial(solve_parts, get_solution(day), parts=parts)
+    with collecting as work_stats, tracking as memory_report:
+        with open(input_file, "r", encoding="utf-8") as fin:
+            if profile:
+                from driver_helpers.profiling import print_stats, profile_call
+
+                result, profile_stats = profile_call(solve, fin)
+                print_stats(profile_stats, profile_limit)
+                if profile_output is not None:
+                    profile_stats.dump_stats(profile_output)
+            else:
+                result = solve(fin)
+
+    # Only complete results are cached, so that any part can be served from the cache
+    if cache and parts == PARTS:
+        result_cache.store(cache_key, result)
+    print(result.report(parts))
+    if work_stats is not None:
+        print(format_stats(work_stats))
+    if memory_report is not None:
+        print(memory_report)
+
+
+@cli.command("run-all")
+@click.argument("days", default="1-25")
+@click.option("-i", "--input-file", "input_file_name", default="input")
+@click.option(
+    "-j", "--jobs", type=click.IntRange(min=1), help="Number of worker processes."
+)
+def run_all(days: str, input_file_name: str, jobs: Optional[int]) -> None:
+    """Run several days (e.g. `1-25` or `1,3,5-7`) in parallel, printing timings."""
+    from concurrent.futures import ProcessPoolExecutor, as_completed
+
+    from driver_helpers.runner import run_day
+    from utils.parallel import set_workers
+
+    input_files = {day: ensure_input(day, input_file_name) for day in parse_days(days)}
+
+    start = time.perf_counter()
+    # The days already run in parallel, so they mustn't start pools of their own, which
+    # would never be shut down since pool workers don't run atexit handlers
+    with ProcessPoolExecutor(jobs, initializer=set_workers, initargs=(1,)) as executor:
+        futures = [
+            executor.submit(run_day, day, input_file)
+            for day, input_file in input_files.items()
+        ]
+        for future in as_completed(futures):
+            print(future.result())
+    print(f"Ran {len(futures)} days in {time.perf_counter() - start:.3f}s")
+
+
+@cli.command()
+@click.argument("day", type=int)
+@click.argument(
+    "directory", type=click.Path(exists=True, file_okay=False, path_type=Path)
+)
+@click.option(
+    "-o",
+    "--output",
+    type=click.File("w"),
+    default="-",
+    help="Write the JSONL records here [default: stdout].",
+)
+@click.option(
+    "-j", "--jobs", type=click.IntRange(min=1), help="Number of worker processes."
+)
+def batch(day: int, directory: Path, output: TextIO, jobs: Optional[int]) -> None:
+    """Run a day on every input in a directory, streaming results as JSON lines."""
+    from concurrent.futures import ProcessPoolExecutor, as_completed
+
+    from driver_helpers.batch import list_inputs, run_input
+    from utils.parallel import set_workers
+
+    input_files = list_inputs(directory)
+    failures = 0
+    start = time.perf_counter()
+    # The days already run in parallel, so they mustn't start pools of their own, which
+    # would never be shut down since pool workers don't run atexit handlers
+    with ProcessPoolExecutor(jobs, initializer=set_workers, initargs=(1,)) as executor:
+        futures = [executor.submit(run_input, day, path) for path in input_files]
+        for future in as_completed(futures):
+            record = future.result()
+            failures += record.error is not None
+            output.write(record.to_json() + "\n")
+            output.flush()
+    click.echo(
+        f"Ran {len(futures)} inputs ({failures} failed)"
+        f" in {time.perf_counter() - start:.3f}s",
+        err=True,
+    )
+
+
+@cli.command()
+@click.argument("days", type=int, nargs=-1, required=True)
+@click.option("-i", "--input-file", "input_file_name", default="input")
+@click.option(
+    "--warmup",
+    default=1,
+    show_default=True,
+    type=click.IntRange(min=0),
+    help="Untimed runs per day.",
+)
+@click.option(
+    "--repeat",
+    default=10,
+    show_default=True,
+    type=click.IntRange(min=1),
+    help="Timed runs per day.",
+)
+@click.option("--save", type=click.Path(path_type=Path), help="Write a JSON baseline.")
+@click.option(
+    "--compare",
+    "compare_to",
+    type=click.Path(exists=True, path_type=Path),
+    help="Compare against a JSON baseline.",
+)
+@click.option(
+    "--threshold",
+    default=0.1,
+    show_default=True,
+    help="Allowed median slowdown against the baseline, as a fraction.",
+)
+@click.option(
+    "--memory", is_flag=True, help="Also report memory, from one extra untimed run."
+)
+@click.option(
+    "--memory-limit",
+    default=10,
+    show_default=True,
+    help="Number of allocation sites to show when reporting memory.",
+)
+def bench(
+    days: tuple[int, ...],
+    input_file_name: str,
+    warmup: int,
+    repeat: int,
+    save: Optional[Path],
+    compare_to: Optional[Path],
+    threshold: float,
+    memory: bool,
+    memory_limit: int,
+) -> None:
+    """Benchmark the solutions for some days, with the input held in memory."""
+    from driver_helpers.bench import benchmark, compare, load_baseline, save_baseline
+
+    timings = {}
+    for day in days:
+        data = ensure_input(day, input_file_name).read_text(encoding="utf-8")
+        timings[day] = benchmark(day, data, warmup, repeat)
+        print(f"Day {day:02}: {timings[day]}")
+        if memory:
+            from driver_helpers.memory import measure_memory
+
+            print(measure_memory(day, data, memory_limit))
+
+    if save is not None:
+        save_baseline(save, timings)
+    if compare_to is not None:
+        regressions = compare(timings, load_baseline(compare_to), threshold)
+        if regressions:
+            raise click.ClickException(
+                f"Regressed days: {', '.join(str(day) for day in regressions)}"
+            )
+
+
+@cli.command()
+@click.argument("day", default=CURR_DAY)
+@click.option(
+    "-s", "--scale", type=int, help="Size of the input [default: about real size]."
+)
+@click.option("--seed", default=0, show_default=True, help="Seed for the generator.")
+@click.option(
+    "-o",
+    "--output-file",
+    "output_file_name",
+    help="File name in the day's folder [default: generated-<scale>-<seed>].",
+)
+def generate(
+    day: int, scale: Optional[int], seed: int, output_file_name: Optional[str]
+) -> None:
+    """Generate a valid input for a day, the same every time for a given scale and seed."""
+    import random
+
+    from driver_helpers.registry import get_generator
+
+    try:
+        generator = get_generator(day)
+    except ValueError as error:
+        raise click.ClickException(str(error)) from error
+    if scale is None:
+        scale = generator.DEFAULT_SCALE
+    path = day_folder(day) / (output_file_name or f"generated-{scale}-{seed}")
+    start = time.perf_counter()
+    with path.open("w", newline="\n") as fout:
+        generator.generate(fout, scale, random.Random(seed))
+    click.echo(f"Wrote {path} in {time.perf_counter() - start:.2f}s")
+
+
+@cli.command()
+@click.option(
+    "--repeat",
+    default=20,
+    show_default=True,
+    type=click.IntRange(min=1),
+    help="Number of launches.",
+)
+@click.option(
+    "--budget",
+    default=STARTUP_BUDGET,
+    show_default=True,
+    help="Maximum median startup time in seconds.",
+)
+def startup(repeat: int, budget: float) -> None:
+    """Measure how long the driver takes to start, failing if it's over budget."""
+    from driver_helpers.bench import measure_startup
 
-    module = importlib.import_module(f"day{day_str}.day{day_str}")
-    with open(input_file, "r", encoding="utf-8") as fin:
-        result = module.run(fin)
-    print(result)
+    timings = measure_startup(repeat)
+    print(f"Startup: {timings}")
+    if timings.median > budget:
+        raise click.ClickException(
+            f"Median startup {timings.median:.3f}s is over the {budget:.3f}s budget"
+        )
 
 
 if __name__ == "__main__":
@@ -1,15 +1,39 @@
-"""Helpers related to interacting with the AOC website."""
+"""Helpers related to interacting with the AOC website.
+
+The site and session can be overridden with the AOC_BASE_URL and AOC_SESSION environment
+variables, e.g. to point at a local stand-in server.
+"""
 import os
 import sqlite3
+from functools import cache
 from pathlib import Path
 from typing import BinaryIO
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
-INPUT_URL = "https://adventofcode.com/{year}/day/{day}/input"
+BASE_URL_ENV = "AOC_BASE_URL"
+SESSION_ENV = "AOC_SESSION"
+DEFAULT_BASE_URL = "https://adventofcode.com"
+INPUT_PATH = "/{year}/day/{day}/input"
 COOKIE_HOST = ".adventofcode.com"
 COOKIE_NAME = "session"
 
+RETRIES = Retry(
+    total=5,
+    backoff_factor=0.5,
+    status_forcelist=(429, 500, 502, 503, 504),
+    allowed_methods=("GET",),
+)
+MAX_CONNECTIONS = 25
+
+
+@cache
+def get_session_cookie() -> str:
+    """Get the AOC session cookie, only looking it up once per process."""
+    return os.environ.get(SESSION_ENV) or get_firefox_session()
+
 
 def get_firefox_session() -> str:
     """Steal a session cookie from the firefox sqlite database."""
@@ -53,9 +77,29 @@ def get_session_cookie_from_db(sqlite_file: Path) -> str:
         conn.close()
 
 
-def download_problem_input(filelike: BinaryIO, year: int, day: int) -> str:
-    """Download the input file for a problem."""
-    session = get_firefox_session()
-    resp = requests.get(INPUT_URL.format(year=year, day=day), cookies={"session": session})
+@cache
+def get_http_session() -> requests.Session:
+    """Get a shared HTTP session that keeps connections alive and retries with backoff."""
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        max_retries=RETRIES, pool_connections=1, pool_maxsize=MAX_CONNECTIONS
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def fetch_problem_input(year: int, day: int) -> bytes:
+    """Fetch the input for a problem."""
+    base_url = os.environ.get(BASE_URL_ENV, DEFAULT_BASE_URL)
+    resp = get_http_session().get(
+        base_url + INPUT_PATH.format(year=year, day=day),
+        cookies={COOKIE_NAME: get_session_cookie()},
+    )
     resp.raise_for_status()
-    filelike.write(resp.content)
+    return resp.content
+
+
+def download_problem_input(filelike: BinaryIO, year: int, day: int) -> None:
+    """Download the input file for a problem."""
+    filelike.write(fetch_problem_input(year, day))
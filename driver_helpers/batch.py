@@ -0,0 +1,50 @@
+"""Helpers for running a day over a whole directory of inputs."""
+from __future__ import annotations
+
+import json
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Optional
+
+from driver_helpers.runner import run_day
+
+
+@dataclass
+class BatchRecord:
+    """The outcome of running a day on one input of a batch."""
+
+    input: str
+    part1: Any = None
+    part2: Any = None
+    wall_time: Optional[float] = None
+    cpu_time: Optional[float] = None
+    error: Optional[str] = None
+
+    def to_json(self) -> str:
+        """Format the record as a single line of JSON."""
+        # Answers are usually ints or strings, but fall back to str for anything else
+        return json.dumps(asdict(self), default=str)
+
+
+def list_inputs(directory: Path) -> list[Path]:
+    """List the input files in a directory, skipping hidden files."""
+    return sorted(
+        path
+        for path in directory.iterdir()
+        if path.is_file() and not path.name.startswith(".")
+    )
+
+
+def run_input(day: int, input_file: Path) -> BatchRecord:
+    """Run a day on one input, recording any error rather than raising it."""
+    try:
+        day_run = run_day(day, input_file)
+    except Exception as e:
+        return BatchRecord(input_file.name, error=f"{type(e).__name__}: {e}")
+    return BatchRecord(
+        input_file.name,
+        day_run.result.part1,
+        day_run.result.part2,
+        day_run.wall_time,
+        day_run.cpu_time,
+    )
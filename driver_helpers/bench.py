@@ -0,0 +1,109 @@
+"""Helpers for benchmarking solutions."""
+from __future__ import annotations
+
+import io
+import json
+import statistics
+import subprocess
+import sys
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+from driver_helpers.registry import get_solution
+from driver_helpers.runner import solve_parts
+
+
+@dataclass
+class Timings:
+    """Summary statistics over repeated runs of a solution, in seconds."""
+
+    runs: int
+    min: float
+    median: float
+    p95: float
+
+    @staticmethod
+    def from_samples(samples: list[float]) -> Timings:
+        """Summarize a list of timing samples."""
+        p95 = (
+            statistics.quantiles(samples, n=20, method="inclusive")[-1]
+            if len(samples) > 1
+            else samples[0]
+        )
+        return Timings(len(samples), min(samples), statistics.median(samples), p95)
+
+    def __str__(self) -> str:
+        return (
+            f"min {self.min:.6f}s, median {self.median:.6f}s, p95 {self.p95:.6f}s"
+            f" ({self.runs} runs)"
+        )
+
+
+def benchmark(day: int, data: str, warmup: int, repeat: int) -> Timings:
+    """Time repeated runs of a day's solution on in-memory input."""
+    solution = get_solution(day)
+    for _ in range(warmup):
+        solve_parts(solution, io.StringIO(data))
+
+    samples = []
+    for _ in range(repeat):
+        fin = io.StringIO(data)
+        start = time.perf_counter()
+        solve_parts(solution, fin)
+        samples.append(time.perf_counter() - start)
+    return Timings.from_samples(samples)
+
+
+def measure_startup(repeat: int) -> Timings:
+    """Time launching the driver in a fresh interpreter, up to the point it would dispatch."""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run(
+            [sys.executable, "driver.py", "--help"], check=True, capture_output=True
+        )
+        samples.append(time.perf_counter() - start)
+    return Timings.from_samples(samples)
+
+
+def save_baseline(path: Path, timings: dict[int, Timings]) -> None:
+    """Save benchmark timings as a JSON baseline."""
+    with path.open("w", encoding="utf-8") as fout:
+        json.dump({str(day): asdict(t) for day, t in timings.items()}, fout, indent=2)
+
+
+def load_baseline(path: Path) -> dict[int, Timings]:
+    """Load benchmark timings from a JSON baseline."""
+    with path.open("r", encoding="utf-8") as fin:
+        return {int(day): Timings(**t) for day, t in json.load(fin).items()}
+
+
+def compare(
+    timings: dict[int, Timings], baseline: dict[int, Timings], threshold: float
+) -> list[int]:
+    """Print a comparison against a baseline, returning the days that regressed.
+
+    A day regresses when its median is more than `threshold` (a fraction) slower.
+    """
+    regressions = []
+    for day, current in timings.items():
+        if day not in baseline:
+            print(f"Day {day:02}: no baseline")
+            continue
+        # A baseline too quick to time has no meaningful change to compare against
+        if baseline[day].median > 0:
+            change = current.median / baseline[day].median - 1
+            regressed = change > threshold
+            change_text = f"{change:+.1%}"
+        else:
+            regressed = False
+            change_text = "n/a"
+        print(
+            f"Day {day:02}: median {current.median:.6f}s vs baseline"
+            f" {baseline[day].median:.6f}s ({change_text})"
+            + (" REGRESSION" if regressed else "")
+        )
+        if regressed:
+            regressions.append(day)
+    return regressions
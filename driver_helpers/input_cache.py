@@ -0,0 +1,64 @@
+"""A content-addressed cache of puzzle inputs shared between workspaces.
+
+Inputs are stored as `<cache>/inputs/<year>/<day>/<sha256>`, with a `latest` file in each
+day's folder naming the most recently downloaded input.  The cache lives in
+~/.cache/aoc unless AOC_CACHE_DIR says otherwise.
+"""
+import hashlib
+import os
+import shutil
+from pathlib import Path
+from typing import Optional
+
+CACHE_DIR_ENV = "AOC_CACHE_DIR"
+LATEST = "latest"
+
+
+def cache_root() -> Path:
+    """Get the root folder of the driver's caches."""
+    return Path(os.environ.get(CACHE_DIR_ENV, Path.home() / ".cache" / "aoc"))
+
+
+def day_cache_dir(year: int, day: int) -> Path:
+    """Get the folder holding the cached inputs for a day."""
+    return cache_root() / "inputs" / str(year) / str(day).zfill(2)
+
+
+def write_atomic(path: Path, data: bytes) -> None:
+    """Write a file such that concurrent readers never see it partially written."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    tmp_path.write_bytes(data)
+    os.replace(tmp_path, path)
+
+
+def store(year: int, day: int, data: bytes) -> Path:
+    """Add an input to the cache, marking it as the latest for the day."""
+    digest = hashlib.sha256(data).hexdigest()
+    path = day_cache_dir(year, day) / digest
+    if not path.is_file():
+        write_atomic(path, data)
+    write_atomic(day_cache_dir(year, day) / LATEST, digest.encode())
+    return path
+
+
+def lookup(year: int, day: int) -> Optional[Path]:
+    """Find the latest cached input for a day, if there is an intact one."""
+    try:
+        digest = (day_cache_dir(year, day) / LATEST).read_text().strip()
+        data = (day_cache_dir(year, day) / digest).read_bytes()
+    except FileNotFoundError:
+        return None
+    if hashlib.sha256(data).hexdigest() != digest:
+        return None
+    return day_cache_dir(year, day) / digest
+
+
+def install_input(year: int, day: int, destination: Path) -> None:
+    """Put a day's input at the destination, only downloading it if it isn't cached."""
+    cached = lookup(year, day)
+    if cached is None:
+        from driver_helpers.aoc_site import fetch_problem_input
+
+        cached = store(year, day, fetch_problem_input(year, day))
+    shutil.copyfile(cached, destination)
@@ -0,0 +1,55 @@
+"""Helpers for collecting the counters and timers recorded by solutions."""
+from __future__ import annotations
+
+import os
+import tempfile
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator
+
+from utils import instrument
+from utils.instrument import STATS_DIR_ENV, STATS_PID_ENV, Stats
+
+
+@contextmanager
+def collect_stats() -> Iterator[Stats]:
+    """Record stats while inside the context, filling in the yielded stats on exit.
+
+    The stats include any tasks wrapped with `utils.instrument.instrumented` that ran in
+    worker processes meanwhile.
+    """
+    stats = Stats()
+    with tempfile.TemporaryDirectory() as stats_dir:
+        os.environ[STATS_DIR_ENV] = stats_dir
+        os.environ[STATS_PID_ENV] = str(os.getpid())
+        instrument.take()
+        instrument.enable()
+        try:
+            yield stats
+        finally:
+            instrument.enable(False)
+            del os.environ[STATS_DIR_ENV]
+            del os.environ[STATS_PID_ENV]
+
+            stats.merge(instrument.take())
+            for worker_stats in Path(stats_dir).glob("*.json"):
+                stats.merge(Stats.from_json(worker_stats.read_text(encoding="utf-8")))
+
+
+def format_stats(stats: Stats) -> str:
+    """Format stats as a table, sorted by name."""
+    if not stats.counts:
+        return "No stats recorded"
+    rows = [("Name", "Count", "Time")] + [
+        (
+            name,
+            f"{stats.counts[name]:,}",
+            f"{stats.seconds[name]:.3f}s" if name in stats.seconds else "",
+        )
+        for name in sorted(stats.counts)
+    ]
+    widths = [max(len(row[i]) for row in rows) for i in range(3)]
+    return "\n".join(
+        f"{name:<{widths[0]}}  {count:>{widths[1]}}  {seconds:>{widths[2]}}".rstrip()
+        for name, count, seconds in rows
+    )
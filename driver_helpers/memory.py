@@ -0,0 +1,203 @@
+"""Helpers for measuring how much memory solutions use.
+
+tracemalloc only sees allocations made by Python in this process, so work handed off to
+worker processes only shows up in the peak RSS of the children.  Tracing also slows
+solutions down several times over, so memory is never measured during timed runs.
+
+The allocation sites come from a snapshot taken whenever the traced memory grows.  For
+the first second a profile hook checks on every call and return, so that even quick runs
+are caught at their peak, before the function holding the memory returns.  The hook slows
+solutions down several times more again, so after that a thread checks periodically,
+which is frequent enough for longer runs.  cProfile replaces the hook, so under
+`--profile` only the thread checks.
+"""
+from __future__ import annotations
+
+import io
+import multiprocessing
+import sys
+import threading
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from types import FrameType
+from typing import Any, Iterator, Optional
+
+from driver_helpers.registry import get_solution
+from driver_helpers.runner import solve_parts
+
+# How long to check for a new peak on every call and return
+HOOK_DURATION = 1.0
+# How often to check whether the traced memory has reached a new peak after that
+SAMPLE_INTERVAL = 0.05
+# How much the traced memory must grow by before it's worth another snapshot
+SNAPSHOT_GROWTH = 1.1
+
+_IGNORED_TRACES = [
+    tracemalloc.Filter(False, __file__),
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, threading.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+]
+
+
+@dataclass
+class AllocationSite:
+    """Memory still allocated from one line of code."""
+
+    location: str
+    size: int
+    blocks: int
+
+
+@dataclass
+class MemoryReport:
+    """Peak memory usage, in bytes, with the lines that had the most allocated."""
+
+    traced_peak: int = 0
+    # Peak RSS covers the life of the process, not just the measured code
+    peak_rss: Optional[int] = None
+    children_peak_rss: Optional[int] = None
+    # The sites are from a snapshot taken within SNAPSHOT_GROWTH of the traced peak
+    snapshot_size: int = 0
+    top_sites: list[AllocationSite] = field(default_factory=list)
+
+    def __str__(self) -> str:
+        lines = [f"Traced peak {format_size(self.traced_peak)}"]
+        if self.peak_rss is not None:
+            lines.append(f"Peak RSS {format_size(self.peak_rss)}")
+        if self.children_peak_rss:
+            lines.append(f"Peak RSS of children {format_size(self.children_peak_rss)}")
+        if self.top_sites:
+            lines.append(
+                f"Top allocation sites with {format_size(self.snapshot_size)} traced:"
+            )
+            lines.extend(
+                f"  {format_size(site.size):>10} {site.blocks:>10,} blocks"
+                f"  {site.location}"
+                for site in self.top_sites
+            )
+        return "\n".join(lines)
+
+
+def format_size(size: int) -> str:
+    """Format a number of bytes in KiB or MiB."""
+    if size < 2**20:
+        return f"{size / 2**10:.1f} KiB"
+    return f"{size / 2**20:.1f} MiB"
+
+
+class _PeakSampler(threading.Thread):
+    """Snapshots the traced allocations whenever they grow past the last snapshot."""
+
+    def __init__(self) -> None:
+        super().__init__(daemon=True)
+        self.stopped = threading.Event()
+        self.lock = threading.Lock()
+        self.snapshot: Optional[tracemalloc.Snapshot] = None
+        self.snapshot_size = 0
+        self.threshold = 0
+        self.hook_deadline = time.perf_counter() + HOOK_DURATION
+
+    def run(self) -> None:
+        while not self.stopped.wait(SAMPLE_INTERVAL):
+            self.sample()
+
+    def hook(self, frame: FrameType, event: str, arg: Any) -> None:
+        """Check for a new peak, as a profile hook for the calling thread."""
+        if tracemalloc.get_traced_memory()[0] > self.threshold:
+            self.sample()
+        if time.perf_counter() > self.hook_deadline:
+            sys.setprofile(None)
+
+    def sample(self) -> None:
+        with self.lock:
+            current, _ = tracemalloc.get_traced_memory()
+            if self.snapshot is None or current > self.threshold:
+                self.snapshot = tracemalloc.take_snapshot()
+                self.snapshot_size = current
+                self.threshold = int(current * SNAPSHOT_GROWTH)
+
+
+def _peak_rss() -> tuple[Optional[int], Optional[int]]:
+    """Get the peak RSS of this process and of its finished children, if available."""
+    try:
+        import resource
+    except ImportError:
+        return None, None  # Not available on Windows
+    # Linux reports kilobytes, but macOS reports bytes
+    scale = 1 if sys.platform == "darwin" else 1024
+    return (
+        _linux_peak_rss() or resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale,
+        resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss * scale,
+    )
+
+
+def _linux_peak_rss() -> Optional[int]:
+    """Get the peak RSS of this process on Linux.
+
+    Unlike getrusage, this starts again when a process execs, rather than including the
+    RSS of the process that started it.
+    """
+    try:
+        with open("/proc/self/status", encoding="ascii") as status:
+            for line in status:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    return None
+
+
+@contextmanager
+def track_memory(limit: int) -> Iterator[MemoryReport]:
+    """Trace allocations while inside the context, filling in the yielded report on exit.
+
+    Up to `limit` of the lines with the most memory allocated are reported.
+    """
+    report = MemoryReport()
+    sampler = _PeakSampler()
+    tracemalloc.start()
+    sampler.start()
+    sys.setprofile(sampler.hook)
+    try:
+        yield report
+    finally:
+        sys.setprofile(None)
+        sampler.stopped.set()
+        sampler.join()
+        sampler.sample()
+        _, report.traced_peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        report.peak_rss, report.children_peak_rss = _peak_rss()
+        assert sampler.snapshot is not None
+        report.snapshot_size = sampler.snapshot_size
+        statistics = sampler.snapshot.filter_traces(_IGNORED_TRACES).statistics(
+            "lineno"
+        )
+        report.top_sites = [
+            AllocationSite(str(stat.traceback[0]), stat.size, stat.count)
+            for stat in statistics[:limit]
+        ]
+
+
+def _measure_memory(day: int, data: str, limit: int) -> MemoryReport:
+    solution = get_solution(day)
+    fin = io.StringIO(data)
+    with track_memory(limit) as report:
+        solve_parts(solution, fin)
+    return report
+
+
+def measure_memory(day: int, data: str, limit: int) -> MemoryReport:
+    """Measure the memory used by one run of a day's solution on in-memory input.
+
+    It runs in a fresh process, so that the peak RSS isn't left over from earlier runs.
+    """
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(1, mp_context=context) as executor:
+        return executor.submit(_measure_memory, day, data, limit).result()
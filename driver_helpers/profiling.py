@@ -0,0 +1,41 @@
+"""Helpers for profiling solutions."""
+from __future__ import annotations
+
+import cProfile
+import os
+import pstats
+import tempfile
+from pathlib import Path
+from typing import Callable, TypeVar
+
+from utils.profiling import PROFILE_DIR_ENV, PROFILE_PID_ENV
+
+R = TypeVar("R")
+
+
+def profile_call(func: Callable[..., R], *args: object) -> tuple[R, pstats.Stats]:
+    """Call a function under cProfile.
+
+    The returned stats include any tasks wrapped with `utils.profiling.profiled` that
+    ran in worker processes during the call.
+    """
+    with tempfile.TemporaryDirectory() as profile_dir:
+        os.environ[PROFILE_DIR_ENV] = profile_dir
+        os.environ[PROFILE_PID_ENV] = str(os.getpid())
+        profiler = cProfile.Profile()
+        try:
+            result = profiler.runcall(func, *args)
+        finally:
+            del os.environ[PROFILE_DIR_ENV]
+            del os.environ[PROFILE_PID_ENV]
+
+        stats = pstats.Stats(profiler)
+        for worker_stats in Path(profile_dir).glob("*.pstats"):
+            stats.add(str(worker_stats))
+    return result, stats
+
+
+def print_stats(stats: pstats.Stats, limit: int) -> None:
+    """Print the functions with the highest cumulative and self time."""
+    stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(limit)
+    stats.sort_stats(pstats.SortKey.TIME).print_stats(limit)
@@ -0,0 +1,40 @@
+"""Registry mapping days to their solutions."""
+import importlib
+from functools import cache
+from types import ModuleType
+from typing import Callable, TextIO
+
+from result import Result
+
+Solution = Callable[[TextIO], Result]
+
+SOLUTION_MODULES = {day: f"day{day:02}.day{day:02}" for day in range(1, 26)}
+GENERATOR_MODULES = {day: f"day{day:02}.generator" for day in range(1, 26)}
+
+
+@cache
+def get_solution(day: int) -> Solution:
+    """Get the `run` entry point for a day, importing its module on first use."""
+    if day not in SOLUTION_MODULES:
+        raise ValueError(f"No solution for day {day}")
+    module = importlib.import_module(SOLUTION_MODULES[day])
+    solution: Solution = module.run
+    return solution
+
+
+def get_generator(day: int) -> ModuleType:
+    """Get the input generator module for a day.
+
+    Each one provides DEFAULT_SCALE and `generate(file, scale, rng)`.  Newly bootstrapped
+    days don't have one until it's written.
+    """
+    if day not in GENERATOR_MODULES:
+        raise ValueError(f"No generator for day {day}")
+    module_name = GENERATOR_MODULES[day]
+    try:
+        return importlib.import_module(module_name)
+    except ModuleNotFoundError as error:
+        # Only a missing day or generator, not something the generator imports
+        if error.name not in (module_name, module_name.partition(".")[0]):
+            raise
+        raise ValueError(f"No generator for day {day}") from error
@@ -0,0 +1,97 @@
+"""An opt-in cache of solution results.
+
+Results are keyed on a hash of the input along with the source of the day's module and
+every module from this repo that it imports, so editing any of them invalidates the
+entry.  Entries live in the `results` folder of the driver's cache and the least
+recently used ones are evicted once there are more than MAX_ENTRIES.
+"""
+import ast
+import hashlib
+import os
+import pickle
+from pathlib import Path
+from typing import Iterable, Optional
+
+from driver_helpers.input_cache import cache_root, write_atomic
+from driver_helpers.registry import SOLUTION_MODULES
+from result import Result
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+MAX_ENTRIES = 256
+
+
+def module_path(module_name: str) -> Optional[Path]:
+    """Find the source file for a module in this repo, if it is one."""
+    base = REPO_ROOT.joinpath(*module_name.split("."))
+    for candidate in (base.with_suffix(".py"), base / "__init__.py"):
+        if candidate.is_file():
+            return candidate
+    return None
+
+
+def imported_modules(source: Path) -> Iterable[str]:
+    """List the names of the modules that a source file imports."""
+    for node in ast.walk(ast.parse(source.read_bytes())):
+        if isinstance(node, ast.Import):
+            yield from (alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and node.module is not None:
+            yield node.module
+            # `from package import module` imports a module too
+            yield from (f"{node.module}.{alias.name}" for alias in node.names)
+
+
+def source_files(module_name: str) -> list[Path]:
+    """Find the source files for a module and everything from this repo it imports."""
+    found: set[Path] = set()
+    to_visit = [module_name]
+    while to_visit:
+        path = module_path(to_visit.pop())
+        if path is None or path in found:
+            continue
+        found.add(path)
+        to_visit.extend(imported_modules(path))
+    return sorted(found)
+
+
+def cache_key(day: int, input_file: Path) -> str:
+    """Compute the cache key for running a day on an input."""
+    digest = hashlib.sha256(input_file.read_bytes())
+    for path in source_files(SOLUTION_MODULES[day]):
+        digest.update(str(path.relative_to(REPO_ROOT)).encode())
+        digest.update(path.read_bytes())
+    return digest.hexdigest()
+
+
+def results_dir() -> Path:
+    """Get the folder where results are cached."""
+    return cache_root() / "results"
+
+
+def lookup(key: str) -> Optional[Result]:
+    """Look up a cached result, marking it as recently used.
+
+    An entry that can't be loaded, e.g. because it was cut short or pickles a class that
+    has since moved, counts as a miss and is overwritten by the next store.
+    """
+    path = results_dir() / key
+    try:
+        with path.open("rb") as fin:
+            result: Result = pickle.load(fin)
+    except (
+        FileNotFoundError,
+        pickle.UnpicklingError,
+        EOFError,
+        AttributeError,
+        ImportError,
+    ):
+        return None
+    os.utime(path)
+    return result
+
+
+def store(key: str, result: Result) -> None:
+    """Cache a result, evicting the least recently used results if over capacity."""
+    write_atomic(results_dir() / key, pickle.dumps(result))
+    entries = sorted(results_dir().iterdir(), key=lambda p: p.stat().st_mtime)
+    for path in entries[:-MAX_ENTRIES]:
+        path.unlink(missing_ok=True)
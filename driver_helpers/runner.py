@@ -0,0 +1,70 @@
+"""Helpers for running solutions and timing them."""
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Collection, TextIO
+
+from driver_helpers.registry import Solution, get_solution
+from result import PARTS, Result
+
+
+@dataclass
+class DayRun:
+    """The result of running a single day, along with how long it took."""
+
+    day: int
+    result: Result
+    wall_time: float
+    cpu_time: float
+
+    def __str__(self) -> str:
+        return (
+            f"Day {self.day:02} (wall {self.wall_time:.3f}s, cpu {self.cpu_time:.3f}s)"
+            f"\n{self.result}"
+        )
+
+
+def day_folder(day: int) -> Path:
+    """Get the folder containing a day's solution."""
+    return Path(f"day{str(day).zfill(2)}")
+
+
+def parse_days(spec: str) -> list[int]:
+    """Parse a day specification such as `1-25` or `1,3,5-7` into a list of days."""
+    days = []
+    for part in spec.split(","):
+        match part.split("-"):
+            case [day]:
+                days.append(int(day))
+            case [start, end]:
+                days.extend(range(int(start), int(end) + 1))
+            case _:
+                raise ValueError(f"Invalid day specification {part}")
+    return days
+
+
+def solve_parts(
+    solution: Solution, file: TextIO, parts: Collection[int] = PARTS
+) -> Result:
+    """Run a solution, computing only the requested parts."""
+    return solution(file).resolve(parts)
+
+
+def run_day(day: int, input_file: Path) -> DayRun:
+    """Run a day's solution on an input file, recording wall and CPU time.
+
+    CPU time only covers the calling process, not any worker processes the solution spawns.
+    """
+    solution = get_solution(day)
+    wall_start = time.perf_counter()
+    cpu_start = time.process_time()
+    with open(input_file, "r", encoding="utf-8") as fin:
+        result = solve_parts(solution, fin)
+    return DayRun(
+        day,
+        result,
+        wall_time=time.perf_counter() - wall_start,
+        cpu_time=time.process_time() - cpu_start,
+    )
@@ -1,14 +1,35 @@
 """Problem result dataclass."""
+from __future__ import annotations
+
 from dataclasses import dataclass
-from typing import Any
+from typing import Any, Collection
+
+PARTS = (1, 2)
 
 
 @dataclass
 class Result:
-    """A class to hold the result of a problem."""
+    """A class to hold the result of a problem.
+
+    Either part can be given as a zero-argument callable instead of a value, in which
+    case it is only computed when that part is asked for.
+    """
 
     part1: Any
     part2: Any
 
+    def get(self, part: int) -> Any:
+        """Get the answer to one part, computing it if it was deferred."""
+        value = self.part1 if part == 1 else self.part2
+        return value() if callable(value) else value
+
+    def resolve(self, parts: Collection[int] = PARTS) -> Result:
+        """Compute the requested parts, leaving any others as None."""
+        return Result(*(self.get(part) if part in parts else None for part in PARTS))
+
+    def report(self, parts: Collection[int] = PARTS) -> str:
+        """Format the requested parts for display."""
+        return "\n".join(f"Part {part} Result:\n{self.get(part)}" for part in parts)
+
     def __str__(self) -> str:
-        return f"Part 1 Result:\n{self.part1}\nPart 2 Result:\n{self.part2}"
+        return self.report()
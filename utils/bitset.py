@@ -0,0 +1,88 @@
+"""Helper utilities for storing sets of symbols from a small alphabet as int bitmasks.
+
+Union, intersection and difference are then just |, & and & ~ on plain ints, which are
+much cheaper to build and hash than sets or frozensets.
+"""
+from typing import Generic, Hashable, Iterable, Iterator, TypeVar
+
+T = TypeVar("T", bound=Hashable)
+
+
+def popcount(mask: int) -> int:
+    """Count the bits set in a mask."""
+    return mask.bit_count()
+
+
+def iter_bits(mask: int) -> Iterator[int]:
+    """Iterate over the positions of the bits set in a mask, lowest first."""
+    while mask:
+        lowest = mask & -mask
+        yield lowest.bit_length() - 1
+        mask ^= lowest
+
+
+class Alphabet(Generic[T]):
+    """Assigns each symbol of an alphabet its own bit, in the order given."""
+
+    def __init__(self, symbols: Iterable[T]) -> None:
+        """Build an alphabet from distinct symbols."""
+        self.symbols = list(symbols)
+        self.bits = {symbol: 1 << i for i, symbol in enumerate(self.symbols)}
+        if len(self.bits) != len(self.symbols):
+            raise ValueError("Symbols in an alphabet must be distinct")
+        # The mask containing every symbol
+        self.full = (1 << len(self.symbols)) - 1
+
+    def bit(self, symbol: T) -> int:
+        """Get the mask containing just one symbol."""
+        return self.bits[symbol]
+
+    def index(self, symbol: T) -> int:
+        """Get the position of a symbol's bit."""
+        return self.bits[symbol].bit_length() - 1
+
+    def mask(self, symbols: Iterable[T]) -> int:
+        """Get the mask containing some symbols."""
+        # Summing distinct powers of two is the same as or-ing them, but runs in C
+        return sum(map(self.bits.__getitem__, set(symbols)))
+
+    def decode(self, mask: int) -> list[T]:
+        """Get the symbols in a mask, in alphabet order."""
+        return [self.symbols[i] for i in iter_bits(mask)]
+
+    def __len__(self) -> int:
+        return len(self.symbols)
+
+
+def subset_max(values: list[int]) -> list[int]:
+    """For every mask, get the largest of the values at that mask and all its subsets.
+
+    This is the sum over subsets transform with max in place of sum, taking O(2^k * k)
+    for k bits.  The values must be indexed by mask, so there are 2^k of them.
+    """
+    best = list(values)
+    size = len(best)
+    step = 1
+    while step < size:
+        # Fold each mask without this bit into the same mask with it, a whole slice at a
+        # time.  Either way of slicing covers every mask, so take the one with fewer.
+        stride = 2 * step
+        if step <= size // stride:
+            for offset in range(step):
+                with_bit = best[offset + step :: stride]
+                best[offset + step :: stride] = _pairwise_max(
+                    with_bit, best[offset::stride]
+                )
+        else:
+            for start in range(0, size, stride):
+                with_bit = best[start + step : start + stride]
+                best[start + step : start + stride] = _pairwise_max(
+                    with_bit, best[start : start + step]
+                )
+        step = stride
+    return best
+
+
+def _pairwise_max(left: list[int], right: list[int]) -> list[int]:
+    # Several times faster than map(max, left, right), which calls a builtin per pair
+    return [x if x > y else y for x, y in zip(left, right)]
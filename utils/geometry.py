@@ -1,8 +1,17 @@
-"""Helper utilities related to geometry."""
+"""Helper utilities related to geometry.
+
+Points are named tuples rather than dataclasses so that building, hashing and comparing
+them all happens in C, which matters in the days that do millions of point operations.
+Dense sets of 3d points are better kept in a VoxelGrid, which needs a byte per point in
+its bounding box rather than a whole tuple per point.
+"""
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import Iterable
+from array import array
+from typing import Iterable, NamedTuple, Optional, Sequence, Union
+
+# Skips the argument handling of the generated __new__ in the hottest methods
+_new_tuple = tuple.__new__
 
 
 def unit(num: int) -> int:
@@ -10,8 +19,7 @@ def unit(num: int) -> int:
     return -1 if num < 0 else (1 if num > 0 else 0)
 
 
-@dataclass(frozen=True)
-class Point2D:
+class Point2D(NamedTuple):
     """Represents a point in 2d cartesian space."""
 
     x: int
@@ -23,13 +31,13 @@ class Point2D:
         x, y = s.split(separator)
         return Point2D(int(x), int(y))
 
-    def __add__(self, other: Point2D) -> Point2D:
+    def __add__(self, other: Point2D) -> Point2D:  # type: ignore[override]
         """Add this point to another."""
-        return Point2D(self.x + other.x, self.y + other.y)
+        return _new_tuple(Point2D, (self[0] + other[0], self[1] + other[1]))
 
     def __sub__(self, other: Point2D) -> Point2D:
         """Subtract another point from this one."""
-        return Point2D(self.x - other.x, self.y - other.y)
+        return _new_tuple(Point2D, (self[0] - other[0], self[1] - other[1]))
 
     def unit(self) -> Point2D:
         """Return a unit vector from this point."""
@@ -37,8 +45,8 @@ class Point2D:
 
     def neighbours(self) -> Iterable[Point2D]:
         """Return the cardinal neighbours of this point."""
-        for direction in DIRECTIONS:
-            yield self + direction
+        x, y = self
+        return [_new_tuple(Point2D, (x + dx, y + dy)) for dx, dy in DIRECTIONS]
 
     def points_between(self, other: Point2D) -> Iterable[Point2D]:
         """Return the points between this point and another in a line."""
@@ -59,8 +67,7 @@ class Point2D:
         return abs(self.x - other.x) + abs(self.y - other.y)
 
 
-@dataclass(frozen=True)
-class Point3D:
+class Point3D(NamedTuple):
     """Represents a point in 3d cartesian space.
 
     If I was smarter, I'd genericize this from Point2D.
@@ -77,14 +84,19 @@ class Point3D:
         x, y, z = s.split(separator)
         return Point3D(int(x), int(y), int(z))
 
-    def __add__(self, other: Point3D) -> Point3D:
+    def __add__(self, other: Point3D) -> Point3D:  # type: ignore[override]
         """Add this point to another."""
-        return Point3D(self.x + other.x, self.y + other.y, self.z + other.z)
+        return _new_tuple(
+            Point3D, (self[0] + other[0], self[1] + other[1], self[2] + other[2])
+        )
 
     def neighbours(self) -> Iterable[Point3D]:
         """Return the cardinal neighbours of this point."""
-        for direction in DIRECTIONS_3D:
-            yield self + direction
+        x, y, z = self
+        return [
+            _new_tuple(Point3D, (x + dx, y + dy, z + dz))
+            for dx, dy, dz in DIRECTIONS_3D
+        ]
 
 
 DIRECTIONS_3D = [
@@ -102,3 +114,159 @@ ALL_DIRECTIONS = DIRECTIONS + [
     Point2D(-1, 1),
     Point2D(-1, -1),
 ]
+
+
+# Swaps empty and filled voxels
+_INVERT = bytes.maketrans(b"\x00\x01", b"\x01\x00")
+
+
+def _shift(lanes: int, offset: int) -> int:
+    """Move every byte lane of an int along by a flat index offset."""
+    return lanes << 8 * offset if offset > 0 else lanes >> -8 * offset
+
+
+class VoxelGrid:
+    """A dense box of voxels, each either empty (0) or filled (1), as a flat bytearray.
+
+    The box is surrounded by a shell of empty voxels one thick, so every filled voxel has
+    all six neighbours in the grid.  Whole-grid operations read the bytearray as one big
+    int with a byte lane per voxel, so shifting it by a neighbour's offset lines every
+    voxel up with that neighbour, and a single &, | or + then handles every voxel at
+    once in C.  Lanes that wrap around the end of a row or plane land in the shell.
+    """
+
+    def __init__(self, origin: Point3D, size: Point3D) -> None:
+        """Create an empty grid covering `size` voxels upwards from `origin`."""
+        self.origin = origin
+        self.size = size
+        self.x_stride = size.x + 2
+        self.y_stride = self.x_stride * (size.y + 2)
+        self.data = bytearray(self.y_stride * (size.z + 2))
+
+    @staticmethod
+    def from_points(points: Iterable[tuple[int, int, int]]) -> VoxelGrid:
+        """Create a grid just big enough to hold the points, with them all filled."""
+        xs, ys, zs = array("q"), array("q"), array("q")
+        for x, y, z in points:
+            xs.append(x)
+            ys.append(y)
+            zs.append(z)
+        return VoxelGrid.from_coordinates(xs, ys, zs)
+
+    @staticmethod
+    def from_coordinates(
+        xs: Sequence[int], ys: Sequence[int], zs: Sequence[int]
+    ) -> VoxelGrid:
+        """Create a grid from separate sequences of x, y and z coordinates.
+
+        This avoids building a tuple per point, for inputs with millions of them.
+        """
+        if not xs:
+            return VoxelGrid(Point3D(0, 0, 0), Point3D(0, 0, 0))
+        origin = Point3D(min(xs), min(ys), min(zs))
+        size = Point3D(
+            max(xs) - origin.x + 1, max(ys) - origin.y + 1, max(zs) - origin.z + 1
+        )
+        grid = VoxelGrid(origin, size)
+        # Fold the origin into a single base index, as this runs per point
+        base = grid.index(Point3D(0, 0, 0))
+        x_stride, y_stride = grid.x_stride, grid.y_stride
+        data = grid.data
+        for x, y, z in zip(xs, ys, zs):
+            data[base + x + y * x_stride + z * y_stride] = 1
+        return grid
+
+    def index(self, point: tuple[int, int, int]) -> int:
+        """Get the flat index of a position."""
+        x, y, z = point
+        return (
+            (z - self.origin.z + 1) * self.y_stride
+            + (y - self.origin.y + 1) * self.x_stride
+            + x
+            - self.origin.x
+            + 1
+        )
+
+    def in_bounds(self, point: tuple[int, int, int]) -> bool:
+        """Determine if a position is inside the box, excluding the shell."""
+        return all(0 <= p - o < s for p, o, s in zip(point, self.origin, self.size))
+
+    def __contains__(self, point: tuple[int, int, int]) -> bool:
+        """Check if the voxel at a position is filled."""
+        return self.in_bounds(point) and self.data[self.index(point)] == 1
+
+    def add(self, point: tuple[int, int, int]) -> None:
+        """Fill the voxel at a position."""
+        if not self.in_bounds(point):
+            raise IndexError(f"{point} is outside the grid")
+        self.data[self.index(point)] = 1
+
+    def __len__(self) -> int:
+        """Count the filled voxels."""
+        return self.data.count(1)
+
+    def neighbour_offsets(self) -> list[int]:
+        """Get the flat index offsets to neighbouring voxels, in DIRECTIONS_3D order."""
+        return [
+            self.y_stride,
+            -self.y_stride,
+            self.x_stride,
+            -self.x_stride,
+            1,
+            -1,
+        ]
+
+    def _lanes(self, data: Optional[Union[bytes, bytearray]] = None) -> int:
+        return int.from_bytes(self.data if data is None else data, "little")
+
+    def neighbour_counts(self) -> bytearray:
+        """Count the filled neighbours of every voxel, as a bytearray laid out like data."""
+        filled = self._lanes()
+        # Lanes hold at most 6, so adding them never carries into the next lane
+        counts = sum(_shift(filled, offset) for offset in self.neighbour_offsets())
+        counts &= (1 << 8 * len(self.data)) - 1
+        return bytearray(counts.to_bytes(len(self.data), "little"))
+
+    def exterior(self) -> bytearray:
+        """Flood fill the empty voxels that can be reached from outside the box.
+
+        The result is a mask laid out like data, with a 1 for each exterior voxel.
+        """
+        air = self._lanes(self.data.translate(_INVERT))
+        offsets = self.neighbour_offsets()
+
+        # Start from the shell, which is always empty
+        shell = bytearray(b"\x01") * len(self.data)
+        blank = bytes(self.size.x)
+        for z in range(self.origin.z, self.origin.z + self.size.z):
+            for y in range(self.origin.y, self.origin.y + self.size.y):
+                start = self.index((self.origin.x, y, z))
+                shell[start : start + self.size.x] = blank
+        exterior = self._lanes(shell)
+
+        # Grow into empty neighbours until nothing changes
+        while True:
+            grown = exterior
+            for offset in offsets:
+                grown |= _shift(exterior, offset)
+            grown &= air
+            if grown == exterior:
+                break
+            exterior = grown
+        return bytearray(exterior.to_bytes(len(self.data), "little"))
+
+    def exposed_faces(self, outside: Optional[Union[bytes, bytearray]] = None) -> int:
+        """Count the faces of filled voxels that touch an outside voxel.
+
+        Outside voxels are given by a mask laid out like data, such as the one returned
+        by `exterior`, and default to every empty voxel.
+        """
+        filled = self._lanes()
+        if outside is None:
+            outside = self.data.translate(_INVERT)
+        outside_lanes = self._lanes(outside)
+        # Each lane is 0 or 1, so counting bits counts voxels
+        return sum(
+            (filled & _shift(outside_lanes, offset)).bit_count()
+            for offset in self.neighbour_offsets()
+        )
@@ -0,0 +1,163 @@
+"""A dense rectangular grid of small values, stored as a flat bytearray.
+
+Cells hold ints from 0 to 255, laid out row by row.  The grid can be surrounded by a
+border of `padding` cells, so that searches can step off the edge without a bounds check.
+Coordinates always refer to the grid proper, so the border sits at negative coordinates
+and beyond the width and height.
+"""
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any, Iterator, Optional
+
+from utils.geometry import Point2D
+from utils.parse import RawGrid
+
+if TYPE_CHECKING:
+    import numpy
+
+
+class Grid:
+    """A dense rectangular grid backed by a bytearray."""
+
+    def __init__(
+        self,
+        width: int,
+        height: int,
+        fill: int = 0,
+        padding: int = 0,
+        border: Optional[int] = None,
+    ) -> None:
+        """Create a grid with every cell set to `fill` and the border set to `border`."""
+        self.width = width
+        self.height = height
+        self.padding = padding
+        self.stride = width + 2 * padding
+        self.data = bytearray([fill]) * (self.stride * (height + 2 * padding))
+        if border is not None and border != fill and padding:
+            border_rows = bytes([border]) * (self.stride * padding)
+            self.data[: len(border_rows)] = border_rows
+            self.data[len(self.data) - len(border_rows) :] = border_rows
+            border_cells = bytes([border]) * padding
+            for y in range(height):
+                start = self.index(0, y)
+                self.data[start - padding : start] = border_cells
+                self.data[start + width : start + width + padding] = border_cells
+
+    @staticmethod
+    def from_raw(raw: RawGrid, padding: int = 0, border: int = 0) -> Grid:
+        """Copy a grid of characters read from an input, storing each character's byte."""
+        grid = Grid(raw.width, raw.height, padding=padding, border=border)
+        for y, row in enumerate(raw.rows()):
+            start = grid.index(0, y)
+            grid.data[start : start + raw.width] = row
+        return grid
+
+    def index(self, x: int, y: int) -> int:
+        """Get the flat index of a position."""
+        return (y + self.padding) * self.stride + x + self.padding
+
+    def coords(self, index: int) -> Point2D:
+        """Get the position of a flat index."""
+        y, x = divmod(index, self.stride)
+        return Point2D(x - self.padding, y - self.padding)
+
+    def in_bounds(self, x: int, y: int) -> bool:
+        """Determine if a position is inside the grid proper, excluding the border."""
+        return 0 <= x < self.width and 0 <= y < self.height
+
+    def __contains__(self, position: tuple[int, int]) -> bool:
+        return self.in_bounds(*position)
+
+    def _checked_index(self, position: tuple[int, int]) -> int:
+        x, y = position
+        if not (
+            -self.padding <= x < self.width + self.padding
+            and -self.padding <= y < self.height + self.padding
+        ):
+            raise IndexError(f"{position} is outside the grid")
+        return self.index(x, y)
+
+    def __getitem__(self, position: tuple[int, int]) -> int:
+        """Get the value at a position, which may be in the border."""
+        return self.data[self._checked_index(position)]
+
+    def __setitem__(self, position: tuple[int, int], value: int) -> None:
+        """Set the value at a position, which may be in the border."""
+        self.data[self._checked_index(position)] = value
+
+    def get(self, position: tuple[int, int], default: Any = None) -> Any:
+        """Get the value at a position, or a default if it's outside the grid."""
+        try:
+            return self[position]
+        except IndexError:
+            return default
+
+    def neighbour_offsets(self, diagonal: bool = False) -> list[int]:
+        """Get the flat index offsets to neighbouring cells.
+
+        The cardinal offsets come first, in the same order as geometry.DIRECTIONS.
+        """
+        offsets = [self.stride, 1, -self.stride, -1]
+        if diagonal:
+            offsets += [
+                self.stride + 1,
+                1 - self.stride,
+                self.stride - 1,
+                -self.stride - 1,
+            ]
+        return offsets
+
+    def row_indices(self, y: int) -> range:
+        """Get the flat indices of a row, from left to right."""
+        start = self.index(0, y)
+        return range(start, start + self.width)
+
+    def column_indices(self, x: int) -> range:
+        """Get the flat indices of a column, from top to bottom."""
+        start = self.index(x, 0)
+        return range(start, start + self.height * self.stride, self.stride)
+
+    def row(self, y: int) -> bytearray:
+        """Get a copy of a row."""
+        indices = self.row_indices(y)
+        return self.data[indices.start : indices.stop]
+
+    def column(self, x: int) -> bytearray:
+        """Get a copy of a column."""
+        indices = self.column_indices(x)
+        return self.data[indices.start : indices.stop : indices.step]
+
+    def rows(self) -> Iterator[bytearray]:
+        """Iterate over copies of the rows."""
+        for y in range(self.height):
+            yield self.row(y)
+
+    def items(self) -> Iterator[tuple[Point2D, int]]:
+        """Iterate over the positions and values of every cell, row by row."""
+        for y, row in enumerate(self.rows()):
+            for x, value in enumerate(row):
+                yield Point2D(x, y), value
+
+    def find(self, value: int) -> Point2D:
+        """Find the first position holding a value, excluding the border."""
+        for y, row in enumerate(self.rows()):
+            x = row.find(value)
+            if x != -1:
+                return Point2D(x, y)
+        raise ValueError(f"{value} is not in the grid")
+
+    def as_numpy(self) -> numpy.ndarray:
+        """Get a 2d numpy view of the grid proper, indexed [y, x].
+
+        Raises ImportError if numpy isn't installed.
+        """
+        import numpy
+
+        padded = numpy.frombuffer(self.data, dtype=numpy.uint8).reshape(-1, self.stride)
+        return padded[
+            self.padding : self.padding + self.height,
+            self.padding : self.padding + self.width,
+        ]
+
+    def __str__(self) -> str:
+        return "\n".join(row.decode("latin-1") for row in self.rows())
@@ -0,0 +1,142 @@
+"""Named counters and timers for measuring how much work the hot paths do.
+
+Wall-clock time alone can't tell a change that does less work from one that does the
+same work faster, whereas counts of states expanded or nodes walked are deterministic.
+Everything here is a no-op until `enable` is called, which `driver.py run --stats` does,
+so solutions can keep their counters in place.  Hot loops should still add up counts
+locally and call `count` once per batch, since even a disabled call isn't free.
+
+Work done in worker processes is collected the same way as profiles: tasks wrapped with
+`instrumented` dump their stats into the directory named by the environment variable
+below, for the driver to merge.
+"""
+from __future__ import annotations
+
+import json
+import os
+import time
+import uuid
+from collections import Counter, defaultdict
+from contextlib import nullcontext
+from dataclasses import dataclass, field
+from types import TracebackType
+from typing import Callable, ContextManager, Generic, Optional, TypeVar
+
+STATS_DIR_ENV = "AOC_STATS_DIR"
+STATS_PID_ENV = "AOC_STATS_PID"
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+@dataclass
+class Stats:
+    """Counts and total seconds, keyed by name.
+
+    A timer counts the number of times it ran as well as recording the time taken.
+    """
+
+    counts: Counter[str] = field(default_factory=Counter)
+    seconds: defaultdict[str, float] = field(default_factory=lambda: defaultdict(float))
+
+    def merge(self, other: Stats) -> None:
+        """Add another set of stats into this one."""
+        self.counts.update(other.counts)
+        for name, seconds in other.seconds.items():
+            self.seconds[name] += seconds
+
+    def to_json(self) -> str:
+        """Serialise the stats."""
+        return json.dumps({"counts": self.counts, "seconds": self.seconds})
+
+    @staticmethod
+    def from_json(data: str) -> Stats:
+        """Deserialise stats written by `to_json`."""
+        fields = json.loads(data)
+        return Stats(Counter(fields["counts"]), defaultdict(float, fields["seconds"]))
+
+
+_enabled = False
+_stats = Stats()
+_NULL_TIMER = nullcontext()
+
+
+def enable(enabled: bool = True) -> None:
+    """Start or stop recording stats in this process."""
+    global _enabled
+    _enabled = enabled
+
+
+def is_enabled() -> bool:
+    """Check if stats are being recorded, e.g. to skip gathering the values to count."""
+    return _enabled
+
+
+def count(name: str, amount: int = 1) -> None:
+    """Add to a named counter."""
+    if _enabled:
+        _stats.counts[name] += amount
+
+
+class _Timer:
+    """Adds the time spent inside it to a named timer."""
+
+    __slots__ = ("name", "start")
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.start = 0.0
+
+    def __enter__(self) -> None:
+        self.start = time.perf_counter()
+
+    def __exit__(
+        self,
+        exc_type: Optional[type[BaseException]],
+        exc: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        _stats.seconds[self.name] += time.perf_counter() - self.start
+        _stats.counts[self.name] += 1
+
+
+def timer(name: str) -> ContextManager[None]:
+    """Time a block of code under a name, for use in a with statement."""
+    return _Timer(name) if _enabled else _NULL_TIMER
+
+
+def take() -> Stats:
+    """Get everything recorded in this process so far, and start afresh."""
+    global _stats
+    stats, _stats = _stats, Stats()
+    return stats
+
+
+class InstrumentedTask(Generic[T, R]):
+    """A picklable wrapper around a task that sends back its stats from workers."""
+
+    def __init__(self, func: Callable[[T], R]) -> None:
+        """Wrap a task."""
+        self.func = func
+
+    def __call__(self, arg: T) -> R:
+        """Run the task, recording stats if requested."""
+        stats_dir = os.environ.get(STATS_DIR_ENV)
+        if stats_dir is None or os.environ.get(STATS_PID_ENV) == str(os.getpid()):
+            # Not recording, or running in the driver which sees the stats directly
+            return self.func(arg)
+
+        # Forked workers start with a copy of whatever the driver had recorded
+        take()
+        enable()
+        try:
+            return self.func(arg)
+        finally:
+            path = os.path.join(stats_dir, f"{os.getpid()}-{uuid.uuid4().hex}.json")
+            with open(path, "w", encoding="utf-8") as fout:
+                fout.write(take().to_json())
+
+
+def instrumented(func: Callable[[T], R]) -> InstrumentedTask[T, R]:
+    """Wrap a task that will be sent to a worker process so that its stats are kept."""
+    return InstrumentedTask(func)
@@ -0,0 +1,160 @@
+"""Helper utilities for ranges of integers.
+
+Intervals are inclusive at both ends, matching the way the puzzles describe ranges.
+"""
+from __future__ import annotations
+
+from bisect import bisect_left, bisect_right
+from typing import Generic, Iterable, Iterator, NamedTuple, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+class Interval(NamedTuple):
+    """An inclusive range of integers."""
+
+    start: int
+    end: int
+
+    @staticmethod
+    def parse(s: str, separator: str = "-") -> Interval:
+        """Parse an interval from a string such as `2-4`."""
+        start, end = s.split(separator)
+        return Interval(int(start), int(end))
+
+    @property
+    def length(self) -> int:
+        """Get the number of integers in the interval."""
+        return self.end - self.start + 1
+
+    def contains(self, other: Interval) -> bool:
+        """Check if this interval fully contains another."""
+        return self.start <= other.start and self.end >= other.end
+
+    def contains_point(self, point: int) -> bool:
+        """Check if a single integer is in the interval."""
+        return self.start <= point <= self.end
+
+    def overlaps(self, other: Interval) -> bool:
+        """Check if this interval overlaps with the other at all."""
+        return not (self.end < other.start or self.start > other.end)
+
+
+class IntervalSet:
+    """A set of integers, stored as sorted disjoint intervals.
+
+    Intervals that overlap or touch are merged as they are added, so [1, 2] and [3, 4]
+    become [1, 4].
+    """
+
+    def __init__(self, intervals: Iterable[tuple[int, int]] = ()) -> None:
+        """Build a set from any number of intervals, in any order."""
+        starts: list[int] = []
+        ends: list[int] = []
+        last_end = None
+        for start, end in sorted(intervals):
+            if last_end is not None and start <= last_end + 1:
+                if end > last_end:
+                    ends[-1] = last_end = end
+            else:
+                starts.append(start)
+                ends.append(end)
+                last_end = end
+        self._starts = starts
+        self._ends = ends
+
+    def add(self, start: int, end: int) -> None:
+        """Add an interval, merging it with any that it overlaps or touches."""
+        # The intervals that end at or after start - 1 and begin at or before end + 1
+        first = bisect_left(self._ends, start - 1)
+        last = bisect_right(self._starts, end + 1)
+        if first < last:
+            start = min(start, self._starts[first])
+            end = max(end, self._ends[last - 1])
+        self._starts[first:last] = [start]
+        self._ends[first:last] = [end]
+
+    def union(self, other: IntervalSet) -> IntervalSet:
+        """Get a new set containing everything in either set."""
+        return IntervalSet([*self, *other])
+
+    def total_length(self) -> int:
+        """Count the integers in the set."""
+        return sum(self._ends) - sum(self._starts) + len(self._starts)
+
+    def gaps(self, lower: int, upper: int) -> Iterator[Interval]:
+        """Iterate over the ranges between lower and upper that aren't in the set."""
+        position = lower
+        for start, end in self:
+            if end < position:
+                continue
+            if start > upper:
+                break
+            if start > position:
+                yield Interval(position, start - 1)
+            position = end + 1
+        if position <= upper:
+            yield Interval(position, upper)
+
+    def __contains__(self, point: int) -> bool:
+        i = bisect_right(self._starts, point) - 1
+        return i >= 0 and point <= self._ends[i]
+
+    def __iter__(self) -> Iterator[Interval]:
+        return map(Interval, self._starts, self._ends)
+
+    def __len__(self) -> int:
+        """Get the number of disjoint intervals."""
+        return len(self._starts)
+
+    def __repr__(self) -> str:
+        return f"IntervalSet({list(self)})"
+
+
+class _Node(Generic[T]):
+    """A node of an interval tree, holding the intervals that contain its centre."""
+
+    def __init__(self, items: list[tuple[Interval, T]]) -> None:
+        endpoints = sorted(p for interval, _ in items for p in interval)
+        self.centre = endpoints[len(endpoints) // 2]
+        left = [item for item in items if item[0].end < self.centre]
+        right = [item for item in items if item[0].start > self.centre]
+        here = [item for item in items if item[0].contains_point(self.centre)]
+        self.by_start = sorted(here, key=lambda item: item[0].start)
+        self.by_end = sorted(here, key=lambda item: item[0].end, reverse=True)
+        self.left = _Node(left) if left else None
+        self.right = _Node(right) if right else None
+
+
+class IntervalTree(Generic[T]):
+    """A static tree of intervals, each with a value, for finding those containing a point.
+
+    Queries take O(log n + k) time for k matching intervals.
+    """
+
+    def __init__(self, items: Iterable[tuple[Interval, T]]) -> None:
+        """Build the tree from pairs of intervals and their values."""
+        items = list(items)
+        self._root: Optional[_Node[T]] = _Node(items) if items else None
+
+    def stab(self, point: int) -> list[T]:
+        """Get the values of every interval that contains a point."""
+        found = []
+        node = self._root
+        while node is not None:
+            if point < node.centre:
+                for interval, value in node.by_start:
+                    if interval.start > point:
+                        break
+                    found.append(value)
+                node = node.left
+            elif point > node.centre:
+                for interval, value in node.by_end:
+                    if interval.end < point:
+                        break
+                    found.append(value)
+                node = node.right
+            else:
+                found.extend(value for _, value in node.by_start)
+                break
+        return found
@@ -0,0 +1,123 @@
+"""A shared pool of worker processes for solutions that split their work up.
+
+The pool is started the first time a solution needs it and shut down when the
+interpreter exits, so every day run in a process reuses the same workers.  Commands that
+already run days in worker processes set a single worker there, since pool workers don't
+run atexit handlers and a pool started inside one would never be shut down.
+Tasks are sent in chunks to cut down on pickling and round trips, and are wrapped so that
+their work shows up in `--profile` and `--stats`.
+
+The number of workers comes from the environment variable below, which the driver's
+`--workers` option sets, and defaults to the number of CPUs.  With a single worker,
+tasks just run in the calling process.
+"""
+from __future__ import annotations
+
+import atexit
+import os
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from typing import Callable, Generic, Iterable, Iterator, Optional, Sequence, TypeVar
+
+from utils.instrument import instrumented
+from utils.profiling import profiled
+
+WORKERS_ENV = "AOC_WORKERS"
+# Each worker gets about this many chunks, to balance the load when tasks vary in size
+CHUNKS_PER_WORKER = 4
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+_executor: Optional[ProcessPoolExecutor] = None
+# Forked workers inherit the global above, but can't use their parent's pool
+_executor_pid: Optional[int] = None
+
+
+def set_workers(workers: int) -> None:
+    """Set the number of worker processes, for this process and any it starts."""
+    if workers < 1:
+        raise ValueError("There must be at least one worker")
+    os.environ[WORKERS_ENV] = str(workers)
+    shutdown()
+
+
+def worker_count() -> int:
+    """Get the number of worker processes to use."""
+    workers = os.environ.get(WORKERS_ENV)
+    return int(workers) if workers else os.cpu_count() or 1
+
+
+def get_executor() -> ProcessPoolExecutor:
+    """Get the shared pool, starting it if need be."""
+    global _executor, _executor_pid
+    if _executor is None or _executor_pid != os.getpid():
+        if _executor_pid is None:
+            atexit.register(shutdown)
+        _executor = ProcessPoolExecutor(worker_count())
+        _executor_pid = os.getpid()
+    return _executor
+
+
+def shutdown() -> None:
+    """Shut the shared pool down, if it's running, waiting for its workers to exit."""
+    global _executor
+    if _executor is not None and _executor_pid == os.getpid():
+        _executor.shutdown(cancel_futures=True)
+    _executor = None
+
+
+class _ChunkTask(Generic[T, R]):
+    """A picklable task that runs a function over a chunk of items."""
+
+    def __init__(self, func: Callable[[T], R]) -> None:
+        self.func = func
+
+    def __call__(self, chunk: Sequence[T]) -> list[R]:
+        return [self.func(item) for item in chunk]
+
+
+def _chunks(items: Sequence[T], chunksize: Optional[int]) -> list[Sequence[T]]:
+    """Split items into chunks, by default so each worker gets a few of them."""
+    if chunksize is None:
+        chunksize = -(len(items) // -(worker_count() * CHUNKS_PER_WORKER)) or 1
+    return [items[i : i + chunksize] for i in range(0, len(items), chunksize)]
+
+
+def _submit_chunks(
+    func: Callable[[T], R], items: Iterable[T], chunksize: Optional[int]
+) -> list[Future[list[R]]]:
+    executor = get_executor()
+    task = profiled(instrumented(_ChunkTask(func)))
+    return [executor.submit(task, chunk) for chunk in _chunks(list(items), chunksize)]
+
+
+def map(
+    func: Callable[[T], R], items: Iterable[T], chunksize: Optional[int] = None
+) -> list[R]:
+    """Apply a picklable function to every item in parallel, keeping them in order."""
+    if worker_count() == 1:
+        return [func(item) for item in items]
+    futures = _submit_chunks(func, items, chunksize)
+    return [result for future in futures for result in future.result()]
+
+
+def imap_unordered(
+    func: Callable[[T], R], items: Iterable[T], chunksize: Optional[int] = None
+) -> Iterator[R]:
+    """Apply a picklable function to every item in parallel, yielding results as they come.
+
+    Closing the iterator early, e.g. after finding what was being searched for, cancels
+    any chunks that haven't started yet.
+    """
+    if worker_count() == 1:
+        yield from (func(item) for item in items)
+        return
+    pending = set(_submit_chunks(func, items, chunksize))
+    try:
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield from future.result()
+    finally:
+        for future in pending:
+            future.cancel()
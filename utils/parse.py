@@ -1,9 +1,34 @@
 """Helper functions for parsing input."""
-from typing import Callable, Iterator, TextIO, TypeVar
+from __future__ import annotations
+
+import mmap
+import os
+from array import array
+from typing import (
+    IO,
+    TYPE_CHECKING,
+    Callable,
+    Iterator,
+    NamedTuple,
+    TextIO,
+    TypeVar,
+    Union,
+)
+
+if TYPE_CHECKING:
+    import numpy
 
 T = TypeVar("T")
 S = TypeVar("S")
 
+Buffer = Union[bytes, mmap.mmap]
+
+# Integers are parsed a chunk of about this many bytes at a time, to bound the memory used
+_INT_CHUNK_SIZE = 1 << 20
+# Translation tables that turn everything but the parts of integers into spaces
+_UNSIGNED_INT_BYTES = bytes(c if c in b"0123456789" else ord(" ") for c in range(256))
+_SIGNED_INT_BYTES = bytes(c if c in b"-0123456789" else ord(" ") for c in range(256))
+
 
 def read_lines(file: TextIO) -> Iterator[str]:
     """Read lines from a file, stripping newlines."""
@@ -25,3 +50,165 @@ def read_groups(
         else:
             result.append(transformer(item))
     yield result
+
+
+def read_buffer(file: IO[str]) -> Buffer:
+    """Get the rest of a file as bytes, memory-mapping it where possible.
+
+    Files on disk are only mapped when nothing has been read from them yet, so either
+    way the buffer holds what `file.read()` would, and the file is left at its end.
+    """
+    try:
+        fileno = file.fileno()
+        at_start = file.tell() == 0
+    except (AttributeError, OSError):
+        # Not a real file, or one being iterated over, which disables tell()
+        return file.read().encode()
+    if not at_start:
+        return file.read().encode()
+    file.seek(0, os.SEEK_END)
+    if os.fstat(fileno).st_size == 0:
+        return b""  # Empty files can't be mapped
+    return mmap.mmap(fileno, 0, access=mmap.ACCESS_READ)
+
+
+def iter_byte_lines(buffer: Buffer) -> Iterator[memoryview]:
+    """Iterate over the lines in a buffer as views into it, stripping newlines."""
+    view = memoryview(buffer)
+    end = len(buffer)
+    start = 0
+    while start < end:
+        newline = buffer.find(b"\n", start)
+        if newline == -1:
+            newline = end
+        line_end = newline
+        if line_end > start and buffer[line_end - 1] == ord("\r"):
+            line_end -= 1
+        yield view[start:line_end]
+        start = newline + 1
+
+
+def read_byte_lines(file: IO[str]) -> Iterator[memoryview]:
+    """Read lines from a file as bytes without copying them, stripping newlines."""
+    return iter_byte_lines(read_buffer(file))
+
+
+class RawGrid(NamedTuple):
+    """A rectangular grid of characters, left in place in the buffer it was read from.
+
+    Row y starts at offset y * stride, with the newline taking up the rest of the stride.
+    """
+
+    data: memoryview
+    width: int
+    height: int
+    stride: int
+
+    def get(self, x: int, y: int) -> int:
+        """Get the byte at a position."""
+        return self.data[y * self.stride + x]
+
+    def row(self, y: int) -> memoryview:
+        """Get a single row."""
+        return self.data[y * self.stride : y * self.stride + self.width]
+
+    def rows(self) -> Iterator[memoryview]:
+        """Iterate over the rows."""
+        for y in range(self.height):
+            yield self.row(y)
+
+
+def read_byte_grid(file: IO[str]) -> RawGrid:
+    """Read a rectangular grid of characters from a file without copying it."""
+    buffer = read_buffer(file)
+    end = len(buffer)
+    while end > 0 and buffer[end - 1] in b"\r\n":
+        end -= 1
+
+    first_newline = buffer.find(b"\n", 0, end)
+    if first_newline == -1:
+        return RawGrid(memoryview(buffer)[:end], end, 1 if end else 0, end + 1)
+    stride = first_newline + 1
+    width = (
+        first_newline - 1 if buffer[first_newline - 1] == ord("\r") else first_newline
+    )
+    height, remainder = divmod(end + stride - width, stride)
+    if remainder:
+        raise ValueError("Grid is not rectangular")
+    return RawGrid(memoryview(buffer), width, height, stride)
+
+
+def parse_ints(buffer: Buffer, signed: bool = True) -> array[int]:
+    """Get every integer in a buffer, in order, as an array of 64 bit ints.
+
+    Anything other than digits separates the integers.  If they are signed, a `-` must
+    only ever be a minus sign, so something like `2-4` needs `signed=False`.
+    """
+    table = _SIGNED_INT_BYTES if signed else _UNSIGNED_INT_BYTES
+    ints = array("q")
+    end = len(buffer)
+    start = 0
+    while start < end:
+        # Chunks end at a newline, so no integer is split between two of them
+        stop = buffer.find(b"\n", min(start + _INT_CHUNK_SIZE, end))
+        stop = end if stop == -1 else stop + 1
+        ints.extend(map(int, buffer[start:stop].translate(table).split()))
+        start = stop
+    return ints
+
+
+def read_ints(file: IO[str], signed: bool = True) -> array[int]:
+    """Read every integer in a file, in order, as an array of 64 bit ints."""
+    return parse_ints(read_buffer(file), signed)
+
+
+class IntTable(NamedTuple):
+    """Integers from an input with the same number of them on every line.
+
+    They are stored row by row, so each column is a strided view of the data.
+    """
+
+    data: array[int]
+    width: int
+
+    @property
+    def height(self) -> int:
+        """Get the number of rows."""
+        return len(self.data) // self.width
+
+    def row(self, y: int) -> memoryview:
+        """Get a view of a single row."""
+        return memoryview(self.data)[y * self.width : (y + 1) * self.width]
+
+    def column(self, x: int) -> memoryview:
+        """Get a view of a single column."""
+        return memoryview(self.data)[x :: self.width]
+
+    def columns(self) -> list[memoryview]:
+        """Get views of every column."""
+        return [self.column(x) for x in range(self.width)]
+
+    def rows(self) -> Iterator[tuple[int, ...]]:
+        """Iterate over the rows as tuples."""
+        return zip(*self.columns())
+
+    def as_numpy(self) -> numpy.ndarray:
+        """Get a 2d numpy view of the table, indexed [row, column].
+
+        Raises ImportError if numpy isn't installed.
+        """
+        import numpy
+
+        return numpy.frombuffer(self.data, dtype=numpy.int64).reshape(-1, self.width)
+
+
+def read_int_table(file: IO[str], width: int, signed: bool = True) -> IntTable:
+    """Read the integers from a file with `width` of them on each line.
+
+    Only the total is checked, so lines with different numbers of integers go unnoticed
+    as long as they add up to whole rows.
+    """
+    ints = read_ints(file, signed)
+    if len(ints) % width:
+        raise ValueError(f"{len(ints)} integers can't be split into rows of {width}")
+    return IntTable(ints, width)
@@ -0,0 +1,49 @@
+"""Helpers for profiling work that solutions hand off to worker processes.
+
+The driver sets the environment variables below while profiling.  Tasks wrapped with
+`profiled` then profile themselves when they run in another process and dump their
+stats into the directory for the driver to merge.
+"""
+from __future__ import annotations
+
+import cProfile
+import os
+import sys
+import uuid
+from typing import Callable, Generic, TypeVar
+
+PROFILE_DIR_ENV = "AOC_PROFILE_DIR"
+PROFILE_PID_ENV = "AOC_PROFILE_PID"
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+class ProfiledTask(Generic[T, R]):
+    """A picklable wrapper around a task that profiles it in worker processes."""
+
+    def __init__(self, func: Callable[[T], R]) -> None:
+        """Wrap a task."""
+        self.func = func
+
+    def __call__(self, arg: T) -> R:
+        """Run the task, profiling it if requested."""
+        profile_dir = os.environ.get(PROFILE_DIR_ENV)
+        if profile_dir is None or os.environ.get(PROFILE_PID_ENV) == str(os.getpid()):
+            # Not profiling, or running in the driver where the main profiler sees it
+            return self.func(arg)
+
+        # Forked workers inherit the driver's profiler, which nobody would ever collect
+        sys.setprofile(None)
+        profiler = cProfile.Profile()
+        try:
+            return profiler.runcall(self.func, arg)
+        finally:
+            profiler.dump_stats(
+                os.path.join(profile_dir, f"{os.getpid()}-{uuid.uuid4().hex}.pstats")
+            )
+
+
+def profiled(func: Callable[[T], R]) -> ProfiledTask[T, R]:
+    """Wrap a task that will be sent to a worker process so that it can be profiled."""
+    return ProfiledTask(func)
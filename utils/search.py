@@ -0,0 +1,242 @@
+"""Generic graph searches.
+
+Each search takes its starting states and a function giving the neighbours of a state,
+so the days only describe their graph.  States must be hashable, or `key` can map them
+to something that is, e.g. to fold a turn number down to the period of a pattern.  Small
+states such as ints or tuples of ints keep the visited bookkeeping cheap, and searches
+over flat grid indices can track what they've visited in a bytearray instead.
+
+The searches return the first goal state reached along with its distance, or None if no
+goal can be reached.  Without a goal they run until everything reachable is visited,
+which together with `distances` makes them a flood fill.
+"""
+from __future__ import annotations
+
+import heapq
+from collections import deque
+from dataclasses import dataclass
+from itertools import count
+from typing import Any, Callable, Hashable, Iterable, Optional, TypeVar, overload
+
+T = TypeVar("T", bound=Hashable)
+
+Neighbours = Callable[[T], Iterable[T]]
+WeightedNeighbours = Callable[[T], Iterable[tuple[T, int]]]
+
+
+@dataclass
+class SearchStats:
+    """Counts of the work done by a search."""
+
+    expanded: int = 0
+    discovered: int = 0
+
+
+@overload
+def bfs(
+    starts: Iterable[int],
+    neighbours: Neighbours[int],
+    is_goal: Optional[Callable[[int], bool]] = ...,
+    key: None = ...,
+    distances: None = ...,
+    *,
+    visited: bytearray,
+    stats: Optional[SearchStats] = ...,
+) -> Optional[tuple[int, int]]:
+    ...
+
+
+@overload
+def bfs(
+    starts: Iterable[T],
+    neighbours: Neighbours[T],
+    is_goal: Optional[Callable[[T], bool]] = ...,
+    key: Optional[Callable[[T], Hashable]] = ...,
+    distances: Optional[dict[Any, int]] = ...,
+    visited: None = ...,
+    stats: Optional[SearchStats] = ...,
+) -> Optional[tuple[T, int]]:
+    ...
+
+
+def bfs(
+    starts: Iterable[Any],
+    neighbours: Neighbours[Any],
+    is_goal: Optional[Callable[[Any], bool]] = None,
+    key: Optional[Callable[[Any], Hashable]] = None,
+    distances: Optional[dict[Any, int]] = None,
+    visited: Optional[bytearray] = None,
+    stats: Optional[SearchStats] = None,
+) -> Optional[tuple[Any, int]]:
+    """Breadth first search from any of the starts, one level at a time.
+
+    Goals are checked as states are discovered, so the search stops a level earlier
+    than checking them as they are expanded would.  If `visited` is given, states must be
+    ints indexing into it, and any already marked are never entered.  Otherwise the keys
+    of visited states are recorded in `distances`.  Stats are only updated once a level
+    is finished.
+    """
+    if visited is not None:
+        return _dense_bfs(starts, neighbours, is_goal, visited, stats)
+    seen: dict[Hashable, int] = {} if distances is None else distances
+
+    frontier = []
+    for start in starts:
+        start_key = start if key is None else key(start)
+        if start_key in seen:
+            continue
+        seen[start_key] = 0
+        if is_goal is not None and is_goal(start):
+            return start, 0
+        frontier.append(start)
+
+    distance = 0
+    while frontier:
+        distance += 1
+        next_frontier = []
+        for state in frontier:
+            for neighbour in neighbours(state):
+                # Kept inline rather than in a helper, as this is the hottest loop
+                neighbour_key = neighbour if key is None else key(neighbour)
+                if neighbour_key in seen:
+                    continue
+                seen[neighbour_key] = distance
+                if is_goal is not None and is_goal(neighbour):
+                    return neighbour, distance
+                next_frontier.append(neighbour)
+        if stats is not None:
+            stats.expanded += len(frontier)
+            stats.discovered += len(next_frontier)
+        frontier = next_frontier
+    return None
+
+
+def _dense_bfs(
+    starts: Iterable[int],
+    neighbours: Neighbours[int],
+    is_goal: Optional[Callable[[int], bool]],
+    visited: bytearray,
+    stats: Optional[SearchStats],
+) -> Optional[tuple[int, int]]:
+    """Breadth first search over int states, marking them visited in a bytearray."""
+    frontier = []
+    for start in starts:
+        if visited[start]:
+            continue
+        visited[start] = 1
+        if is_goal is not None and is_goal(start):
+            return start, 0
+        frontier.append(start)
+
+    distance = 0
+    while frontier:
+        distance += 1
+        next_frontier = []
+        for state in frontier:
+            for neighbour in neighbours(state):
+                if visited[neighbour]:
+                    continue
+                visited[neighbour] = 1
+                if is_goal is not None and is_goal(neighbour):
+                    return neighbour, distance
+                next_frontier.append(neighbour)
+        if stats is not None:
+            stats.expanded += len(frontier)
+            stats.discovered += len(next_frontier)
+        frontier = next_frontier
+    return None
+
+
+def zero_one_bfs(
+    starts: Iterable[T],
+    neighbours: WeightedNeighbours[T],
+    is_goal: Optional[Callable[[T], bool]] = None,
+    key: Optional[Callable[[T], Hashable]] = None,
+    distances: Optional[dict[Any, int]] = None,
+    stats: Optional[SearchStats] = None,
+) -> Optional[tuple[T, int]]:
+    """Find the cheapest path when every edge costs either 0 or 1."""
+    best: dict[Hashable, int] = {} if distances is None else distances
+    queue: deque[tuple[int, T]] = deque()
+    for start in starts:
+        best[start if key is None else key(start)] = 0
+        queue.append((0, start))
+
+    while queue:
+        distance, state = queue.popleft()
+        if best[state if key is None else key(state)] < distance:
+            continue  # Already reached more cheaply
+        if is_goal is not None and is_goal(state):
+            return state, distance
+        if stats is not None:
+            stats.expanded += 1
+        for neighbour, cost in neighbours(state):
+            neighbour_key = neighbour if key is None else key(neighbour)
+            new_distance = distance + cost
+            if new_distance < best.get(neighbour_key, new_distance + 1):
+                best[neighbour_key] = new_distance
+                if stats is not None:
+                    stats.discovered += 1
+                if cost:
+                    queue.append((new_distance, neighbour))
+                else:
+                    queue.appendleft((new_distance, neighbour))
+    return None
+
+
+def dijkstra(
+    starts: Iterable[T],
+    neighbours: WeightedNeighbours[T],
+    is_goal: Optional[Callable[[T], bool]] = None,
+    key: Optional[Callable[[T], Hashable]] = None,
+    distances: Optional[dict[Any, int]] = None,
+    stats: Optional[SearchStats] = None,
+) -> Optional[tuple[T, int]]:
+    """Find the cheapest path when edges have non-negative costs."""
+    return astar(starts, neighbours, lambda _: 0, is_goal, key, distances, stats)
+
+
+def astar(
+    starts: Iterable[T],
+    neighbours: WeightedNeighbours[T],
+    heuristic: Callable[[T], int],
+    is_goal: Optional[Callable[[T], bool]] = None,
+    key: Optional[Callable[[T], Hashable]] = None,
+    distances: Optional[dict[Any, int]] = None,
+    stats: Optional[SearchStats] = None,
+) -> Optional[tuple[T, int]]:
+    """Find the cheapest path, guided by a heuristic that never overestimates."""
+    best: dict[Hashable, int] = {} if distances is None else distances
+    # The counter breaks ties so that states never need to be comparable
+    tiebreak = count()
+    heap: list[tuple[int, int, int, T]] = []
+    for start in starts:
+        best[start if key is None else key(start)] = 0
+        heap.append((heuristic(start), next(tiebreak), 0, start))
+    heapq.heapify(heap)
+
+    while heap:
+        _, _, distance, state = heapq.heappop(heap)
+        if best[state if key is None else key(state)] < distance:
+            continue  # Already reached more cheaply
+        if is_goal is not None and is_goal(state):
+            return state, distance
+        if stats is not None:
+            stats.expanded += 1
+        for neighbour, cost in neighbours(state):
+            neighbour_key = neighbour if key is None else key(neighbour)
+            new_distance = distance + cost
+            if new_distance < best.get(neighbour_key, new_distance + 1):
+                best[neighbour_key] = new_distance
+                if stats is not None:
+                    stats.discovered += 1
+                heapq.heappush(
+                    heap,
+                    (
+                        new_distance + heuristic(neighbour),
+                        next(tiebreak),
+                        new_distance,
+                        neighbour,
+                    ),
+                )
+    return None